@@ -0,0 +1,318 @@
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import metrics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, parse_qsl, unquote, urlsplit
+from data_manager import (
+    CATALOG_COLUMNS,
+    FACET_FIELDS,
+    NUMERIC_COLUMNS,
+    changes_since,
+    filter_transceivers,
+    get_catalog_tag,
+    get_facets,
+    get_transceiver,
+    get_transceivers,
+    rank_transceivers,
+    start_watcher,
+)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_LOOKUP = 1000
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 100
+
+# Bodies smaller than this are sent uncompressed even if gzip is accepted.
+GZIP_MIN_SIZE = 1024
+
+
+class ApiError(Exception):
+    """Error returned to the client as {"error": message} with an HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _single(params: Dict[str, List[str]], name: str) -> Optional[str]:
+    values = params.get(name)
+    return values[-1] if values else None
+
+def _int_param(params: Dict[str, List[str]], name: str, default: int, low: int, high: int) -> int:
+    value = _single(params, name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer")
+    if not low <= number <= high:
+        raise ApiError(400, f"{name} must be between {low} and {high}")
+    return number
+
+def parse_criteria(params: Dict[str, List[str]]) -> Dict:
+    """Build filter_transceivers() criteria from query parameters."""
+    criteria = {}
+    for field in FACET_FIELDS:
+        values = params.get(field)
+        if values:
+            criteria[field] = values[0] if len(values) == 1 else values
+    for column in NUMERIC_COLUMNS:
+        low = _single(params, f"{column}_min")
+        high = _single(params, f"{column}_max")
+        try:
+            bounds = (None if low is None else float(low), None if high is None else float(high))
+        except ValueError:
+            raise ApiError(400, f"{column}_min and {column}_max must be numbers")
+        if bounds != (None, None):
+            criteria[column] = bounds
+    search = _single(params, 'search')
+    if search:
+        criteria['search'] = search
+    return criteria
+
+def _records(df) -> List[Dict]:
+    """CATALOG_COLUMNS records from a result frame, with missing values as None."""
+    df = df[CATALOG_COLUMNS].astype(object)
+    df = df.where(df.notna(), None)
+    return [dict(zip(CATALOG_COLUMNS, row)) for row in df.itertuples(index=False, name=None)]
+
+def list_transceivers(params: Dict[str, List[str]]) -> Dict:
+    """GET /transceivers"""
+    criteria = parse_criteria(params)
+    sort_by = _single(params, 'sort_by')
+    page = _int_param(params, 'page', 1, 1, 10 ** 9)
+    page_size = _int_param(params, 'page_size', DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+    try:
+        df = filter_transceivers(criteria, sort_by=sort_by)
+    except ValueError as e:
+        raise ApiError(400, str(e))
+    start = (page - 1) * page_size
+    result = {
+        'items': _records(df.iloc[start:start + page_size]),
+        'total': len(df),
+        'page': page,
+        'page_size': page_size,
+        'pages': max(1, math.ceil(len(df) / page_size)),
+    }
+    if _single(params, 'facets') in ('1', 'true'):
+        result['facets'] = get_facets(current_filters=criteria)
+    return result
+
+def facets(params: Dict[str, List[str]]) -> Dict:
+    """GET /facets"""
+    fields = params.get('field') or FACET_FIELDS
+    unknown = [f for f in fields if f not in FACET_FIELDS]
+    if unknown:
+        raise ApiError(400, f"Unknown facet field: {', '.join(unknown)}")
+    return get_facets(fields, parse_criteria(params))
+
+def get_one(sku: str) -> Dict:
+    """GET /transceivers/<sku>"""
+    transceiver = get_transceiver(sku)
+    if transceiver is None:
+        raise ApiError(404, f"Transceiver not found: {sku}")
+    return transceiver
+
+def lookup(skus: List[str]) -> Dict:
+    """GET/POST /lookup: records for the SKUs that exist, those that don't and those not Active."""
+    if len(skus) > MAX_LOOKUP:
+        raise ApiError(400, f"At most {MAX_LOOKUP} SKUs per lookup")
+    result = get_transceivers(skus)
+    return {'found': list(result['found'].values()), 'missing': result['missing'], 'inactive': result['inactive']}
+
+def search(params: Dict[str, List[str]]) -> Dict:
+    """GET /search?q=...: the best-matching transceivers, ranked, with their scores."""
+    query = _single(params, 'q')
+    if not query:
+        raise ApiError(400, "q is required")
+    limit = _int_param(params, 'limit', DEFAULT_SEARCH_LIMIT, 1, MAX_SEARCH_LIMIT)
+    criteria = parse_criteria(params)
+    criteria.pop('search', None)
+    try:
+        ranked = rank_transceivers(query, criteria, limit)
+    except ValueError as e:
+        raise ApiError(400, str(e))
+    found = get_transceivers([sku for sku, _ in ranked])['found']
+    return {'items': [dict(found[sku], score=round(score, 4)) for sku, score in ranked if sku in found]}
+
+def changes(params: Dict[str, List[str]]) -> Dict:
+    """GET /changes?since=N: change records after catalog version N, or a full snapshot."""
+    return changes_since(_int_param(params, 'since', -1, -1, 2 ** 63 - 1))
+
+def route(path: str, params: Dict[str, List[str]]) -> Dict:
+    """Dispatch a GET request to its handler."""
+    if path == '/transceivers':
+        return list_transceivers(params)
+    if path.startswith('/transceivers/'):
+        return get_one(unquote(path[len('/transceivers/'):]))
+    if path == '/facets':
+        return facets(params)
+    if path == '/lookup':
+        return lookup(params.get('sku', []))
+    if path == '/search':
+        return search(params)
+    if path == '/changes':
+        return changes(params)
+    raise ApiError(404, f"No such endpoint: {path}")
+
+def endpoint_name(path: str) -> str:
+    """Route template for a path, used to label request metrics."""
+    if path.startswith('/transceivers/'):
+        return '/transceivers/{sku}'
+    if path in ('/transceivers', '/facets', '/lookup', '/search', '/changes', '/metrics'):
+        return path
+    return 'other'
+
+def make_etag(path: str, query: str) -> str:
+    """Strong ETag for a GET: the catalog tag plus the normalized request.
+
+    The tag comes from the stored catalog and its files, so every server
+    process (and a restarted one) tags the same content alike, and a data
+    file replaced behind our back gets new tags.
+    """
+    request = path + "?" + "&".join(f"{k}={v}" for k, v in sorted(parse_qsl(query)))
+    key = f"{get_catalog_tag()}:{request}"
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+def _matching_etag(header: Optional[str], etags: Tuple[str, ...]) -> Optional[str]:
+    """The first of ``etags`` listed in an If-None-Match header, if any.
+
+    "*" is not handled here: it matches only if the resource exists.
+    """
+    if not header:
+        return None
+    tags = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return next((etag for etag in etags if etag in tags), None)
+
+
+class CatalogHandler(BaseHTTPRequestHandler):
+    """Serves the routes above as JSON."""
+
+    server_version = "OTC-API/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/') or '/'
+        if path == '/metrics':
+            body = metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        etag = make_etag(path, url.query)
+        header = self.headers.get('If-None-Match')
+        matched = _matching_etag(header, (etag, etag[:-1] + '-gzip"'))
+        if matched:
+            self._send_not_modified(path, matched)
+            return
+        any_etag = header is not None and header.strip() == '*'
+        self._handle(path, lambda: route(path, parse_qs(url.query)), etag, any_etag)
+
+    def do_POST(self):
+        path = urlsplit(self.path).path.rstrip('/')
+        if path != '/lookup':
+            self._send_json(405, {'error': "Only /lookup accepts POST"})
+            return
+
+        def handler():
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                # The body cannot be skipped without its length.
+                self.close_connection = True
+                raise ApiError(400, "Content-Length must be a non-negative integer")
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+                skus = body['skus']
+            except (ValueError, KeyError, TypeError):
+                raise ApiError(400, 'Expected a JSON body like {"skus": ["SKU-1", "SKU-2"]}')
+            if not isinstance(skus, list) or not all(isinstance(s, str) for s in skus):
+                raise ApiError(400, "skus must be a list of strings")
+            return lookup(skus)
+
+        self._handle(path, handler)
+
+    def _handle(self, path: str, handler, etag: Optional[str] = None, any_etag: bool = False):
+        """Send what ``handler`` returns, or 304 if ``any_etag`` (If-None-Match: *) and it succeeds."""
+        try:
+            with metrics.timer("api_request", endpoint=endpoint_name(path)):
+                payload = handler()
+        except ApiError as e:
+            self._send_json(e.status, {'error': str(e)})
+            return
+        if any_etag and etag is not None:
+            _, compressed = self._encode(payload)
+            self._send_not_modified(path, etag[:-1] + '-gzip"' if compressed else etag)
+            return
+        self._send_json(200, payload, etag)
+
+    def _send_not_modified(self, path: str, etag: str):
+        metrics.increment("api_not_modified", endpoint=endpoint_name(path))
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+
+    def _accepts_gzip(self) -> bool:
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+
+    def _encode(self, payload) -> Tuple[bytes, bool]:
+        """(response body, whether it is gzip-compressed) for a JSON payload."""
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        compressed = len(body) >= GZIP_MIN_SIZE and self._accepts_gzip()
+        if compressed:
+            body = gzip.compress(body, compresslevel=6)
+        return body, compressed
+
+    def _send_json(self, status: int, payload, etag: Optional[str] = None):
+        body, compressed = self._encode(payload)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Vary', 'Accept-Encoding')
+        if compressed:
+            self.send_header('Content-Encoding', 'gzip')
+        if etag is not None:
+            # Strong ETags must differ between encodings of the same resource.
+            self.send_header('ETag', etag[:-1] + '-gzip"' if compressed else etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    """Create (but do not start) the API server."""
+    return ThreadingHTTPServer((host, port), CatalogHandler)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the transceiver catalog as read-only JSON.")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--watch', type=float, metavar='SECONDS',
+                        help="reload the catalog in the background, checking the data files every SECONDS")
+    args = parser.parse_args()
+    if args.watch:
+        start_watcher(args.watch)
+    server = make_server(args.host, args.port)
+    print(f"Serving catalog API on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
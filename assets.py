@@ -0,0 +1,30 @@
+import base64
+import functools
+import os
+import streamlit as st
+
+# Branding assets. With server.enableStaticServing (see .streamlit/config.toml)
+# Streamlit serves this directory at app/static/, so the browser can fetch and
+# cache the logo instead of receiving it inline on every rerun.
+STATIC_DIR = "static"
+LOGO_FILE = "Ruckus_logo_white-orange.png"
+CSS_FILE = "style.css"
+
+
+@functools.lru_cache(maxsize=None)
+def load_css() -> str:
+    """Return the branding stylesheet as a <style> block, read once per process."""
+    with open(os.path.join(STATIC_DIR, CSS_FILE), 'r') as f:
+        return f"<style>\n{f.read()}</style>"
+
+@functools.lru_cache(maxsize=None)
+def logo_data_uri() -> str:
+    """Return the logo as a base64 data URI, encoded once per process."""
+    with open(os.path.join(STATIC_DIR, LOGO_FILE), 'rb') as f:
+        return "data:image/png;base64," + base64.b64encode(f.read()).decode()
+
+def logo_src() -> str:
+    """Return the logo URL, falling back to a data URI when static serving is off."""
+    if st.get_option("server.enableStaticServing"):
+        return f"app/static/{LOGO_FILE}"
+    return logo_data_uri()
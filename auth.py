@@ -1,51 +1,163 @@
 import hashlib
+import hmac
 import json
 import os
+import secrets
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
 
 AUTH_FILE = "data/auth.json"
+DEFAULT_PASSWORD = "admin123"
 
-def hash_password(password: str) -> str:
-    """Hash a password using SHA-256."""
+# PBKDF2-HMAC-SHA256 work factor for new hashes. Stored hashes record their
+# own iteration count, so raising this only affects passwords set afterwards.
+PBKDF2_ITERATIONS = 600_000
+
+# Lifetime of a login session token, in seconds.
+SESSION_TTL = 8 * 60 * 60
+
+# Parsed AUTH_FILE, reloaded only when its (mtime, size) changes.
+_lock = threading.Lock()
+_config = None
+_config_stat = None
+
+
+def hash_password(password: str, salt: Optional[bytes] = None,
+                  iterations: int = PBKDF2_ITERATIONS) -> str:
+    """Hash a password with PBKDF2-HMAC-SHA256 as "pbkdf2_sha256$iterations$salt$hash"."""
+    if salt is None:
+        salt = secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+    return f"pbkdf2_sha256${iterations}${salt.hex()}${digest.hex()}"
+
+def _legacy_hash(password: str) -> str:
+    """Unsalted SHA-256, as stored before PBKDF2 was used."""
     return hashlib.sha256(password.encode()).hexdigest()
 
+def _check_hash(password: str, stored: str) -> bool:
+    """Compare a password against a PBKDF2 or legacy SHA-256 hash in constant time."""
+    if stored.startswith("pbkdf2_sha256$"):
+        _, iterations, salt, _ = stored.split("$")
+        candidate = hash_password(password, bytes.fromhex(salt), int(iterations))
+    else:
+        candidate = _legacy_hash(password)
+    return hmac.compare_digest(candidate, stored)
+
+def _stat() -> Optional[tuple]:
+    try:
+        st = os.stat(AUTH_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _write_config(config: Dict):
+    """Atomically replace the auth file. Caller must hold _lock."""
+    global _config, _config_stat
+    directory = os.path.dirname(AUTH_FILE)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(AUTH_FILE) + ".")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(config, f, indent=2)
+        os.replace(tmp_path, AUTH_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    _config = config
+    _config_stat = _stat()
+
 def ensure_auth_file():
     """Ensure the auth file exists with a default password."""
-    if not os.path.exists(AUTH_FILE):
-        os.makedirs(os.path.dirname(AUTH_FILE), exist_ok=True)
-        # Default password is "admin123"
-        default_config = {
-            "password_hash": hash_password("admin123")
-        }
-        with open(AUTH_FILE, 'w') as f:
-            json.dump(default_config, f, indent=2)
+    with _lock:
+        if not os.path.exists(AUTH_FILE):
+            _write_config({
+                "password_hash": hash_password(DEFAULT_PASSWORD),
+                "is_default": True,
+                "secret_key": secrets.token_hex(32),
+            })
 
-def verify_password(password: str) -> bool:
-    """Verify a password against the stored hash."""
+def _get_config() -> Dict:
+    """Return the cached auth config, rereading the file only when it changed.
+
+    Files written before PBKDF2 are given the default-password flag and a
+    token signing key on first load; the hash itself is upgraded at the next
+    successful login.
+    """
+    global _config, _config_stat
+    stat = _stat()
+    config = _config
+    if config is not None and stat == _config_stat:
+        return config
     ensure_auth_file()
-    with open(AUTH_FILE, 'r') as f:
-        config = json.load(f)
+    with _lock:
+        stat = _stat()
+        with open(AUTH_FILE, 'r') as f:
+            config = json.load(f)
+        if 'is_default' in config and 'secret_key' in config:
+            _config, _config_stat = config, stat
+        else:
+            config.setdefault('is_default', _check_hash(DEFAULT_PASSWORD, config['password_hash']))
+            config.setdefault('secret_key', secrets.token_hex(32))
+            _write_config(config)
+    return config
 
-    return hash_password(password) == config['password_hash']
+def verify_password(password: str) -> bool:
+    """Verify a password against the stored hash, upgrading a legacy SHA-256 hash on success."""
+    config = _get_config()
+    if not _check_hash(password, config['password_hash']):
+        return False
+    if not config['password_hash'].startswith("pbkdf2_sha256$"):
+        with _lock:
+            _write_config(dict(config, password_hash=hash_password(password)))
+    return True
 
 def change_password(old_password: str, new_password: str) -> bool:
-    """Change the admin password."""
+    """Change the admin password.
+
+    The token signing key is rotated too, so sessions from before the change
+    end; call issue_token() again for the current session.
+    """
     if not verify_password(old_password):
         return False
 
-    ensure_auth_file()
-    with open(AUTH_FILE, 'r') as f:
-        config = json.load(f)
+    config = dict(
+        _get_config(),
+        password_hash=hash_password(new_password),
+        is_default=hmac.compare_digest(new_password, DEFAULT_PASSWORD),
+        secret_key=secrets.token_hex(32),
+    )
+    with _lock:
+        _write_config(config)
+    return True
 
-    config['password_hash'] = hash_password(new_password)
+def _sign(payload: str, key: str) -> str:
+    return hmac.new(bytes.fromhex(key), payload.encode(), hashlib.sha256).hexdigest()
 
-    with open(AUTH_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+def issue_token(ttl: int = SESSION_TTL) -> str:
+    """Return a signed session token that expires ``ttl`` seconds from now."""
+    payload = f"{int(time.time()) + ttl}.{secrets.token_hex(8)}"
+    return f"{payload}.{_sign(payload, _get_config()['secret_key'])}"
 
-    return True
+def login(password: str) -> Optional[str]:
+    """Verify the password and return a new session token, or None if it is wrong."""
+    if not verify_password(password):
+        return None
+    return issue_token()
+
+def verify_token(token: Optional[str]) -> bool:
+    """Check a session token's signature and expiry without touching the password hash."""
+    if not token or not token.isascii():
+        return False
+    payload, _, signature = token.rpartition(".")
+    expires, _, _ = payload.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _sign(payload, _get_config()['secret_key']))
 
 def get_default_password_info() -> str:
     """Return info about the default password if it's still in use."""
-    ensure_auth_file()
-    if verify_password("admin123"):
+    if _get_config()['is_default']:
         return "⚠️ You are using the default password: **admin123**. Please change it immediately!"
     return ""
@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import random
+from typing import Dict, List, Optional
+
+# Catalog sizes the benchmark suite is run at by default.
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+
+SOURCE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "data", "transceivers.json")
+
+# The shipped catalog is all Active with one temperature range; synthetic
+# catalogs mix in the other values so the status and range filters have
+# something to select.
+STATUS_WEIGHTS = {'Active': 0.8, 'EOL': 0.15, 'Discontinued': 0.05}
+INDUSTRIAL_SHARE = 0.2
+INDUSTRIAL_TEMPERATURE = "-40 to 85°C"
+
+
+def load_templates(path: str = SOURCE_FILE) -> List[Dict]:
+    """Real catalog records that synthetic ones are modelled on."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def generate_catalog(size: int, seed: int = 0, templates: Optional[List[Dict]] = None) -> List[Dict]:
+    """Return ``size`` synthetic transceivers.
+
+    Each record copies a real one, so form factor, data rate, wavelength,
+    reach, connector and power keep their real combinations and
+    frequencies. SKUs are made unique, and names and descriptions get
+    extra words drawn from the real descriptions so search has realistic
+    vocabulary. The same seed always gives the same catalog.
+    """
+    templates = templates or load_templates()
+    rng = random.Random(seed)
+    vocabulary = sorted({word for t in templates for word in t['description'].split()})
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    catalog = []
+    for i in range(size):
+        template = templates[rng.randrange(len(templates))]
+        record = dict(template)
+        record['sku'] = f"{template['sku']}-{i:07d}"
+        record['name'] = f"{template['name']} Rev {chr(65 + rng.randrange(26))}{rng.randrange(10)}"
+        record['description'] = " ".join([template['description']] + rng.sample(vocabulary, 3))
+        record['status'] = rng.choices(statuses, weights)[0]
+        if rng.random() < INDUSTRIAL_SHARE:
+            record['temperature'] = INDUSTRIAL_TEMPERATURE
+        catalog.append(record)
+    return catalog
+
+def write_catalog(path: str, size: int, seed: int = 0):
+    """Write a synthetic catalog in the data file format."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(generate_catalog(size, seed), f)
+
+def parse_size(value: str) -> int:
+    """"100k" -> 100000; plain integers are accepted too."""
+    return SIZES.get(value.lower()) or int(value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic transceiver catalog.")
+    parser.add_argument('size', type=parse_size, help="number of SKUs, or one of: " + ", ".join(SIZES))
+    parser.add_argument('output', help="path of the JSON file to write")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    write_catalog(args.output, args.size, args.seed)
+
+if __name__ == "__main__":
+    main()
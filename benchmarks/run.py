@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+import data_manager
+import sqlite_store
+from benchmarks.generate import SIZES, parse_size, write_catalog
+
+# A benchmark whose median time grows by more than this factor over the
+# baseline run is reported as a regression.
+REGRESSION_THRESHOLD = 1.2
+
+LOOKUPS_PER_RUN = 1000
+
+
+class Benchmark:
+    """One timed operation. ``setup`` runs before every repetition, untimed."""
+
+    def __init__(self, name: str, run: Callable, setup: Optional[Callable] = None):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+
+
+def _cold():
+    data_manager.invalidate_cache()
+
+def _loaded():
+    data_manager.invalidate_cache()
+    data_manager.get_transceiver_count()
+
+def _clear_facets():
+    data_manager.get_facets()
+    data_manager._get_catalog().facets.clear()
+
+def _clear_query_cache():
+    data_manager.get_transceiver_count()
+    data_manager._query_cache.clear()
+
+def _consume(chunks):
+    for _ in chunks:
+        pass
+
+def make_benchmarks(skus: List[str], seed: int) -> List[Benchmark]:
+    """Read benchmarks first, then export, then writes (which start new generations)."""
+    rng = random.Random(seed)
+    lookups = [rng.choice(skus) for _ in range(LOOKUPS_PER_RUN)]
+    template = data_manager.get_transceiver(skus[0])
+    counter = iter(range(10 ** 9))
+
+    def add():
+        data_manager.add_transceiver(dict(template, sku=f"BENCH-ADD-{next(counter)}"))
+
+    def update():
+        data_manager.update_transceiver(skus[0], dict(template, name=f"Bench {next(counter)}"))
+
+    def add_victim():
+        data_manager.add_transceiver(dict(template, sku="BENCH-DELETE"))
+
+    return [
+        Benchmark('load', data_manager.get_transceiver_count, _cold),
+        Benchmark('dataframe', data_manager.get_transceivers_df, _loaded),
+        Benchmark('unique_values', lambda: data_manager.get_unique_values('form_factor')),
+        Benchmark('facets', lambda: data_manager.get_facets(
+            current_filters={'data_rate': '10G', 'status': 'Active'}), _clear_facets),
+        Benchmark('filter', lambda: data_manager.filter_transceivers(
+            {'form_factor': ['SFP', 'SFP+'], 'reach_m': (1000, None)}, sort_by='reach_m'), _clear_query_cache),
+        Benchmark('filter_cached', lambda: data_manager.filter_transceivers(
+            {'form_factor': ['SFP', 'SFP+'], 'reach_m': (1000, None)}, sort_by='reach_m')),
+        Benchmark('search_cold', lambda: data_manager.search_transceivers('lr'), _loaded),
+        Benchmark('search', lambda: data_manager.search_transceivers('gigabit lr')),
+        Benchmark('filter_search', lambda: data_manager.filter_transceivers(
+            {'status': 'Active', 'search': 'optical 10g'}), _clear_query_cache),
+        Benchmark('ranked_search', lambda: data_manager.rank_transceivers('qsfp28 lr4 singel mode')),
+        Benchmark('point_lookup', lambda: [data_manager.get_transceiver(sku) for sku in lookups]),
+        Benchmark('bulk_lookup', lambda: data_manager.get_transceivers(lookups)),
+        Benchmark('export_csv', lambda: _consume(data_manager.export_transceivers({'status': 'Active'}))),
+        Benchmark('add', add),
+        Benchmark('update', update),
+        Benchmark('df_after_edit', data_manager.get_transceivers_df, update),
+        Benchmark('rank_after_edit', lambda: data_manager.rank_transceivers('qsfp28 lr4 singel mode'), update),
+        Benchmark('delete', lambda: data_manager.delete_transceiver("BENCH-DELETE"), add_victim),
+    ]
+
+def measure(benchmark: Benchmark, repeats: int) -> Dict:
+    """Time ``repeats`` runs, then one more under tracemalloc for the peak allocation."""
+    times = []
+    for _ in range(repeats):
+        benchmark.setup()
+        start = time.perf_counter()
+        benchmark.run()
+        times.append(time.perf_counter() - start)
+
+    benchmark.setup()
+    tracemalloc.start()
+    try:
+        benchmark.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'benchmark': benchmark.name,
+        'repeats': repeats,
+        'min_s': min(times),
+        'median_s': statistics.median(times),
+        'max_s': max(times),
+        'peak_bytes': peak,
+    }
+
+def run_size(size: int, backend: str, repeats: int, seed: int) -> List[Dict]:
+    """Run every benchmark against a fresh synthetic catalog of ``size`` SKUs."""
+    saved = (data_manager.DATA_FILE, data_manager.JOURNAL_FILE, data_manager.COLUMNAR_FILE,
+             data_manager.SQLITE_FILE, data_manager.STORAGE_BACKEND)
+    tmp = tempfile.mkdtemp(prefix="otc-bench-")
+    try:
+        data_manager.DATA_FILE = os.path.join(tmp, "transceivers.json")
+        data_manager.JOURNAL_FILE = os.path.join(tmp, "transceivers.journal")
+        data_manager.COLUMNAR_FILE = os.path.join(tmp, "transceivers.cols")
+        data_manager.SQLITE_FILE = os.path.join(tmp, "transceivers.db")
+        data_manager.STORAGE_BACKEND = backend
+        data_manager.invalidate_cache()
+        write_catalog(data_manager.DATA_FILE, size, seed)
+        skus = [t['sku'] for t in data_manager.load_transceivers()]
+
+        results = []
+        for benchmark in make_benchmarks(skus, seed):
+            result = measure(benchmark, repeats)
+            result.update(size=size, backend=backend)
+            results.append(result)
+            print(f"{backend:>6} {size:>9} {result['benchmark']:<14} "
+                  f"median {result['median_s'] * 1000:10.2f} ms  "
+                  f"peak {result['peak_bytes'] / 2 ** 20:9.1f} MiB", file=sys.stderr)
+        return results
+    finally:
+        sqlite_store.close_all()
+        (data_manager.DATA_FILE, data_manager.JOURNAL_FILE, data_manager.COLUMNAR_FILE,
+         data_manager.SQLITE_FILE, data_manager.STORAGE_BACKEND) = saved
+        data_manager.invalidate_cache()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def compare(results: List[Dict], baseline: List[Dict]) -> List[Dict]:
+    """Median-time ratios against a baseline run, one entry per benchmark found in both."""
+    previous = {(r['backend'], r['size'], r['benchmark']): r for r in baseline}
+    comparisons = []
+    for result in results:
+        before = previous.get((result['backend'], result['size'], result['benchmark']))
+        if before is None or not before['median_s']:
+            continue
+        ratio = result['median_s'] / before['median_s']
+        comparisons.append({
+            'backend': result['backend'],
+            'size': result['size'],
+            'benchmark': result['benchmark'],
+            'ratio': ratio,
+            'regression': ratio > REGRESSION_THRESHOLD,
+        })
+    return comparisons
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data_manager against synthetic catalogs.")
+    parser.add_argument('--sizes', nargs='+', type=parse_size, default=[SIZES['1k'], SIZES['100k']],
+                        help="catalog sizes, e.g. 1k 100k 1m (default: 1k 100k)")
+    parser.add_argument('--backend', nargs='+', choices=['json', 'sqlite'], default=['json'])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write results as JSON to this file instead of stdout")
+    parser.add_argument('--baseline', help="results file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    results = []
+    for backend in args.backend:
+        for size in args.sizes:
+            results.extend(run_size(size, backend, args.repeats, args.seed))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            report['comparison'] = compare(results, json.load(f)['results'])
+        for c in report['comparison']:
+            if c['regression']:
+                print(f"REGRESSION {c['backend']} {c['size']} {c['benchmark']}: "
+                      f"{c['ratio']:.2f}x baseline", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+from typing import Dict, IO, Optional, Union
+import pandas as pd
+import importer
+
+# Bill-of-materials headers that mean the quantity column.
+QUANTITY_HEADERS = ('quantity', 'qty', 'count')
+
+# Catalog fields shown next to each BOM line.
+DETAIL_FIELDS = ['name', 'form_factor', 'data_rate', 'status']
+
+# Values of the ``result`` column added by annotate().
+RESULT_OK = "OK"
+RESULT_MISSING = "Missing"
+RESULT_INACTIVE = "Not Active"
+
+# Field separators in pasted lines, besides whitespace.
+_SEPARATORS = str.maketrans(",;", "  ")
+
+
+def _frame(data) -> pd.DataFrame:
+    """BOM DataFrame from row dicts or column lists (line, sku, quantity, ...), with numeric quantities."""
+    bom = pd.DataFrame(data)
+    if bom.empty:
+        bom = pd.DataFrame(columns=['line', 'sku', 'quantity'])
+    bom['quantity'] = pd.to_numeric(bom['quantity'], errors='coerce')
+    return bom
+
+def parse_bom_text(text: str) -> pd.DataFrame:
+    """Parse pasted BOM lines of the form "SKU" or "SKU, quantity".
+
+    Commas, semicolons, tabs and spaces all separate the fields, so rows
+    copied from a spreadsheet work. Blank lines and a leading header row
+    are skipped.
+    """
+    lines, skus, quantities = [], [], []
+    for number, line in enumerate(text.translate(_SEPARATORS).splitlines(), start=1):
+        fields = line.split()
+        if not fields:
+            continue
+        if not skus and importer.normalize_header(fields[0]) == 'sku':
+            continue
+        lines.append(number)
+        skus.append(fields[0])
+        quantities.append(fields[1] if len(fields) > 1 else None)
+    return _frame({'line': lines, 'sku': skus, 'quantity': quantities})
+
+def read_bom(source: Union[str, IO], file_format: Optional[str] = None) -> pd.DataFrame:
+    """Read a BOM from a CSV or XLSX file with a ``sku`` (or Part Number) column.
+
+    A quantity column is optional; other columns are kept as they are.
+    """
+    rows = []
+    for number, row in importer.iter_rows(source, file_format):
+        if 'sku' not in row:
+            raise ValueError("The BOM needs a SKU or Part Number column")
+        sku = row.pop('sku')
+        quantity = next((row.pop(h) for h in QUANTITY_HEADERS if h in row), None)
+        rows.append(dict(row, line=number, sku=sku, quantity=quantity or None))
+    bom = _frame(rows)
+    return bom[['line', 'sku', 'quantity'] + [c for c in bom.columns if c not in ('line', 'sku', 'quantity')]]
+
+def annotate(bom: pd.DataFrame, resolution: Dict) -> pd.DataFrame:
+    """Add catalog details and a ``result`` column to BOM lines.
+
+    ``resolution`` is what data_manager.get_transceivers() returned for the
+    BOM's SKUs. ``result`` is RESULT_OK, RESULT_MISSING or RESULT_INACTIVE.
+    """
+    found = resolution['found']
+    inactive = set(resolution['inactive'])
+    skus = bom['sku'].tolist()
+    records = [found.get(sku) for sku in skus]
+    annotated = bom.copy()
+    for field in DETAIL_FIELDS:
+        annotated[field] = [None if r is None else r.get(field) for r in records]
+    annotated['result'] = [
+        RESULT_MISSING if r is None else RESULT_INACTIVE if sku in inactive else RESULT_OK
+        for sku, r in zip(skus, records)
+    ]
+    return annotated
@@ -0,0 +1,80 @@
+import functools
+from typing import Tuple
+import pandas as pd
+
+CARD_FIELDS = [
+    'sku', 'name', 'form_factor', 'data_rate', 'wavelength',
+    'reach', 'connector', 'temperature', 'power', 'description', 'status'
+]
+
+# Rendered cards kept in memory, keyed by the card's field values.
+CARD_CACHE_SIZE = 4096
+
+CARD_TEMPLATE = """
+<div style="background: white; padding: 1.5rem; border-radius: 8px; border: 1px solid #E0E0E0;
+            margin-bottom: 1rem; box-shadow: 0 2px 4px rgba(0,0,0,0.05);
+            transition: all 0.3s ease; border-left: 4px solid #F47920;">
+    <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 1rem;">
+        <div>
+            <div style="font-weight: 700; color: #F47920; font-size: 0.85rem; margin-bottom: 0.25rem;">SKU</div>
+            <div style="font-weight: 600; color: #101820; font-size: 1.1rem;">{sku}</div>
+            <div style="font-weight: 600; color: #6B6B6B; font-size: 0.95rem; margin-top: 0.5rem;">{name}</div>
+        </div>
+        <div>
+            <div style="margin-bottom: 0.5rem;">
+                <span style="font-weight: 700; color: #F47920;">Form Factor:</span>
+                <span style="color: #101820;">{form_factor}</span>
+                <span style="margin: 0 0.5rem;">|</span>
+                <span style="font-weight: 700; color: #F47920;">Data Rate:</span>
+                <span style="color: #101820;">{data_rate}</span>
+            </div>
+            <div style="margin-bottom: 0.5rem;">
+                <span style="font-weight: 700; color: #F47920;">Wavelength:</span>
+                <span style="color: #101820;">{wavelength}</span>
+                <span style="margin: 0 0.5rem;">|</span>
+                <span style="font-weight: 700; color: #F47920;">Reach:</span>
+                <span style="color: #101820;">{reach}</span>
+            </div>
+            <div>
+                <span style="font-weight: 700; color: #F47920;">Connector:</span>
+                <span style="color: #101820;">{connector}</span>
+                <span style="margin: 0 0.5rem;">|</span>
+                <span style="font-weight: 700; color: #F47920;">Temp:</span>
+                <span style="color: #101820;">{temperature}</span>
+            </div>
+        </div>
+        <div style="text-align: right;">
+            <div style="margin-bottom: 0.5rem;">
+                <span style="font-weight: 700; color: #F47920;">Power:</span>
+                <span style="color: #101820;">{power}</span>
+            </div>
+            <div style="display: inline-block; background: {status_color};
+                        color: white; padding: 0.25rem 0.75rem; border-radius: 20px;
+                        font-weight: 600; font-size: 0.85rem;">
+                {status}
+            </div>
+        </div>
+    </div>
+    <div style="margin-top: 1rem; padding-top: 1rem; border-top: 1px solid #E0E0E0;
+                font-style: italic; color: #6B6B6B; font-size: 0.9rem;">
+        {description}
+    </div>
+</div>
+"""
+
+
+@functools.lru_cache(maxsize=CARD_CACHE_SIZE)
+def render_card(values: Tuple) -> str:
+    """Render one product card from its CARD_FIELDS values.
+
+    Memoized on the values themselves, so a card is only rebuilt when its
+    content changes.
+    """
+    row = dict(zip(CARD_FIELDS, values))
+    status_color = '#4CAF50' if row['status'] == 'Active' else '#F44336'
+    return CARD_TEMPLATE.format(status_color=status_color, **row).strip()
+
+def render_cards(df: pd.DataFrame) -> str:
+    """Render the cards for every row of ``df`` as one HTML block."""
+    rows = df[CARD_FIELDS].itertuples(index=False, name=None)
+    return "\n".join(render_card(values) for values in rows)
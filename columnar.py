@@ -0,0 +1,197 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # Text columns are then decoded into Python strings.
+    pa = None
+
+# File layout: MAGIC, the header length as a little-endian uint64, a JSON
+# header, then 64-byte aligned data blocks. Categorical string columns are
+# stored as a table of their distinct values (UTF-8, NUL separated) plus
+# int32 codes into it, -1 meaning missing. Other string columns use the
+# Arrow large_string layout (validity bitmap, int64 offsets, UTF-8 data), so
+# with pyarrow installed they are used straight from the mapping. Float
+# columns are stored as raw float64.
+MAGIC = b"OTCCOL02"
+ALIGN = 64
+_LENGTH = struct.Struct("<Q")
+
+# mkstemp() creates files readable by their owner only; replacements get
+# the mode of the file they replace, or the usual default for a new one.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _pad(size: int) -> int:
+    return -size % ALIGN
+
+def match_mode(fd: int, path: str):
+    """Give the open file ``fd`` the permissions of ``path``, or 0666 less the umask if it does not exist."""
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    if hasattr(os, 'fchmod'):
+        os.fchmod(fd, mode)
+
+def _categorical_column(values: pd.Series) -> Optional[Tuple[np.ndarray, List[str]]]:
+    """(codes, categories), or None if a category is not a string or contains NUL."""
+    table = values.cat.categories.tolist()
+    if not all(isinstance(s, str) and "\0" not in s for s in table):
+        return None
+    return values.cat.codes.to_numpy().astype(np.int32), table
+
+def _text_column(values: pd.Series) -> Optional[Tuple[bytes, np.ndarray, bytes]]:
+    """(validity bitmap, offsets, UTF-8 data) in Arrow layout, or None if a value cannot be encoded."""
+    items = values.tolist()
+    valid = np.fromiter((isinstance(v, str) for v in items), dtype=bool, count=len(items))
+    if not all(ok or v is None or v is pd.NA or (isinstance(v, float) and np.isnan(v))
+               for v, ok in zip(items, valid)):
+        return None
+    try:
+        encoded = [v.encode() if ok else b"" for v, ok in zip(items, valid)]
+    except UnicodeEncodeError:
+        return None
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return np.packbits(valid, bitorder='little').tobytes(), offsets, b"".join(encoded)
+
+def _text_values(buffer, start: int, column: Dict, rows: int):
+    """A text column as a zero-copy Arrow-backed array, or an object array without pyarrow."""
+    blocks = [column['validity'], column['offsets'], column['data']]
+    if pa is not None:
+        mapped = pa.py_buffer(buffer)
+        validity, offsets, data = (mapped.slice(start + b['offset'], b['size']) for b in blocks)
+        array = pa.Array.from_buffers(pa.large_string(), rows, [validity, offsets, data])
+        return pd.array(array, dtype=pd.StringDtype("pyarrow", na_value=np.nan))
+    validity, offsets, data = (buffer[start + b['offset']:start + b['offset'] + b['size']] for b in blocks)
+    valid = np.unpackbits(np.frombuffer(validity, dtype=np.uint8), count=rows, bitorder='little')
+    offsets = np.frombuffer(offsets, dtype=np.int64).tolist()
+    return np.array([
+        data[offsets[i]:offsets[i + 1]].decode() if valid[i] else None for i in range(rows)
+    ], dtype=object)
+
+def write(path: str, df: pd.DataFrame, string_columns: List[str], float_columns: List[str],
+          versions: np.ndarray, meta: Dict) -> bool:
+    """Atomically write the given columns of ``df`` plus per-row versions.
+
+    ``meta`` is stored in the header and returned by load(). Returns False,
+    writing nothing, if some value cannot be represented.
+    """
+    blocks = []
+    offset = 0
+
+    def add_block(data: bytes) -> Dict:
+        nonlocal offset
+        block = {'offset': offset, 'size': len(data)}
+        blocks.append(data + b"\0" * _pad(len(data)))
+        offset += len(data) + _pad(len(data))
+        return block
+
+    rows = len(df)
+    columns = {}
+    for name in string_columns:
+        values = df[name] if name in df.columns else pd.Series([None] * rows, dtype=object)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            encoded = _categorical_column(values)
+            if encoded is None:
+                return False
+            codes, table = encoded
+            columns[name] = {
+                'type': 'categorical',
+                'count': len(table),
+                'codes': add_block(codes.tobytes()),
+                'table': add_block("\0".join(table).encode()),
+            }
+            continue
+        encoded = _text_column(values)
+        if encoded is None:
+            return False
+        validity, offsets, data = encoded
+        columns[name] = {
+            'type': 'text',
+            'validity': add_block(validity),
+            'offsets': add_block(offsets.tobytes()),
+            'data': add_block(data),
+        }
+    for name in float_columns:
+        values = df[name].to_numpy(dtype=np.float64) if name in df.columns else np.full(rows, np.nan)
+        columns[name] = {'type': 'float64', 'data': add_block(values.tobytes())}
+
+    header = dict(meta, rows=rows, columns=columns,
+                  versions=add_block(np.asarray(versions, dtype=np.int64).tobytes()))
+    header_bytes = json.dumps(header).encode()
+    header_bytes += b" " * _pad(len(MAGIC) + _LENGTH.size + len(header_bytes))
+
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            match_mode(f.fileno(), path)
+            f.write(MAGIC)
+            f.write(_LENGTH.pack(len(header_bytes)))
+            f.write(header_bytes)
+            for block in blocks:
+                f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+def load(path: str) -> Optional[Tuple[Dict, pd.DataFrame, np.ndarray]]:
+    """Memory-map a file written by write().
+
+    Returns (header, DataFrame, versions), or None if the file is missing or
+    not in this format. Float columns, codes, versions and (with pyarrow)
+    text columns are read-only views of the mapping, so processes that load
+    the same file share its pages; only the categories are decoded.
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None
+    prefix = len(MAGIC) + _LENGTH.size
+    if len(buffer) < prefix or buffer[:len(MAGIC)] != MAGIC:
+        return None
+    (header_size,) = _LENGTH.unpack_from(buffer, len(MAGIC))
+    try:
+        header = json.loads(buffer[prefix:prefix + header_size])
+    except ValueError:
+        return None
+    start = prefix + header_size
+    rows = header['rows']
+
+    def array(block: Dict, dtype) -> np.ndarray:
+        return np.frombuffer(buffer, dtype=dtype, count=block['size'] // np.dtype(dtype).itemsize,
+                             offset=start + block['offset'])
+
+    data = {}
+    for name, column in header['columns'].items():
+        if column['type'] == 'float64':
+            data[name] = array(column['data'], np.float64)
+            continue
+        if column['type'] == 'text':
+            data[name] = _text_values(buffer, start, column, rows)
+            continue
+        codes = array(column['codes'], np.int32)
+        table_block = column['table']
+        text = buffer[start + table_block['offset']:start + table_block['offset'] + table_block['size']]
+        table = text.decode().split("\0") if column['count'] else []
+        data[name] = pd.Categorical.from_codes(codes, categories=table)
+    df = pd.DataFrame(data, index=pd.RangeIndex(rows), copy=False)
+    return header, df, array(header['versions'], np.int64)
@@ -1,10 +1,494 @@
+import columnar
 import json
 import os
-from typing import List, Dict, Optional
+import exporter
+import importer
+import matching
+import metrics
+import overlay
+import query_cache
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
+import sqlite_store
+from search_index import SEARCH_FIELDS, RankedIndex, RankedOverlay, tokenize
+from specs import NUMERIC_COLUMNS, add_spec_columns, parse_specs
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within the process.
+    fcntl = None
 
 DATA_FILE = "data/transceivers.json"
 
+# Storage backend: "json" (DATA_FILE plus journal) or "sqlite" (SQLITE_FILE).
+# The SQLite database is populated from DATA_FILE the first time it is opened.
+STORAGE_BACKEND = os.environ.get("OTC_STORAGE_BACKEND", "json")
+SQLITE_FILE = "data/transceivers.db"
+
+# Mutations are appended to this log (one JSON object per line) instead of
+# rewriting DATA_FILE. Once the log holds JOURNAL_COMPACT_THRESHOLD entries it
+# is folded back into DATA_FILE, which stays a plain JSON list of records.
+JOURNAL_FILE = "data/transceivers.journal"
+JOURNAL_COMPACT_THRESHOLD = 500
+
+# Columnar copy of the catalog (see columnar.py), memory-mapped at startup
+# instead of parsing DATA_FILE. It records the file signature it was built
+# from and is rewritten whenever DATA_FILE is, or on the next load after
+# journal appends make it stale. JSON backend only.
+COLUMNAR_FILE = "data/transceivers.cols"
+
+# Shared mode for several server processes on one host: every process
+# serves the catalog straight from the memory-mapped COLUMNAR_FILE, so its
+# pages are held once by the OS rather than once per process. Writers
+# rewrite the file before releasing the write lock; a process that finds it
+# stale takes the lock, so only one of them rebuilds it from the JSON files.
+SHARED_CATALOG = os.environ.get("OTC_SHARED_CATALOG") == "1"
+
+# Times a reader rereads the JSON files when a writer in another process
+# replaces them mid-read.
+LOAD_RETRIES = 3
+
+# Seconds between checks of the data files by the background watcher.
+WATCH_INTERVAL = 1.0
+
+CATALOG_COLUMNS = [
+    'sku', 'name', 'form_factor', 'data_rate', 'wavelength',
+    'reach', 'connector', 'temperature', 'power', 'description', 'status'
+]
+
+_CATALOG_KEYS = frozenset(CATALOG_COLUMNS)
+_FRAME_COLUMNS = frozenset(CATALOG_COLUMNS + NUMERIC_COLUMNS)
+
+# Allowed values for the enumerated fields, shared by the admin forms and
+# bulk import validation.
+FORM_FACTORS = ["SFP", "SFP+", "SFP28", "QSFP+", "QSFP28", "QSFP-DD"]
+DATA_RATES = ["1G", "10G", "25G", "40G", "100G", "400G"]
+CONNECTORS = ["LC", "SC", "MPO/MTP", "MPO-16"]
+STATUSES = ["Active", "EOL", "Discontinued"]
+FIELD_CHOICES = {
+    'form_factor': FORM_FACTORS,
+    'data_rate': DATA_RATES,
+    'connector': CONNECTORS,
+    'status': STATUSES,
+}
+
+# Fields offered as dropdown filters on the catalog page.
+FACET_FIELDS = ['form_factor', 'data_rate', 'connector', 'status']
+
+# Keys accepted by filter_transceivers() and get_facets(). Facet fields take
+# a value or list of values, NUMERIC_COLUMNS a (min, max) range and search a
+# search term.
+FILTER_FIELDS = FACET_FIELDS + NUMERIC_COLUMNS + ['search']
+
+# Writes the search index follows as an overlay of changed documents (see
+# search_index.RankedOverlay) before the next search rebuilds it.
+MAX_RANKED_CHANGES = 4096
+
+# Facet results kept per catalog generation before the cache is cleared.
+FACET_CACHE_SIZE = 256
+
+# Memory for filter_transceivers() results kept for reuse, in MiB; 0 turns
+# the cache off. Results are dropped as soon as the catalog changes.
+QUERY_CACHE_MB = int(os.environ.get("OTC_QUERY_CACHE_MB", "128"))
+
+# With copy-on-write (always on from pandas 3) a shallow copy is enough to
+# keep callers' edits out of the shared catalog DataFrame.
+_COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3 or pd.options.mode.copy_on_write is True
+
+# Process-wide catalog cache. Readers take whatever _Catalog is current
+# without locking; writers hold _lock (plus a file lock shared with other
+# processes, see _writer()) and publish a new _Catalog when they are done.
+# _index_lock makes concurrent readers build a snapshot's search index once.
+_lock = threading.RLock()
+_index_lock = threading.Lock()
+_write_depth = 0
+_catalog = None
+_generation = 0
+
+# Background reloading (see start_watcher()): the thread, its stop event
+# and what it last did, for get_watcher_status().
+_watcher = None
+_watcher_stop = None
+_watcher_status = {}
+
+_query_cache = query_cache.QueryCache(QUERY_CACHE_MB << 20)
+
+# Facet results for the SQLite backend and the change number they hold for;
+# the JSON backend keeps them on the catalog snapshot instead.
+_sqlite_facets = (None, {})
+
+
+class ConcurrentModificationError(Exception):
+    """A write named a record version that is no longer current."""
+
+
+class _Catalog:
+    """Immutable snapshot of the stored catalog for one generation.
+
+    ``records`` maps SKU to record in file order and doubles as the SKU index;
+    ``versions`` maps SKU to the change number that last wrote the record.
+    Neither is modified once the snapshot is published: writers take a
+    layered copy (see overlay.py), apply their change and publish a
+    successor via ``derive()``. Derived views are built lazily and belong to
+    their snapshot, except that a successor made by one change starts from
+    its parent's DataFrame with that change applied.
+
+    A snapshot loaded from the columnar file (see from_columns()) starts
+    from its DataFrame instead; ``records`` and ``versions`` are then built
+    from it only if something asks for them.
+    """
+
+    def __init__(self, records: Optional[Dict[str, Dict]], versions: Optional[Dict[str, int]],
+                 signature: Optional[Tuple], generation: int, seq: int = 0, journal_entries: int = 0):
+        self._records = records
+        self._versions = versions
+        self._version_array = None
+        self.signature = signature
+        self.generation = generation
+        self.seq = seq
+        self.journal_entries = journal_entries
+        self.journal_torn = False
+        # Whether every record fits the columnar file exactly (see
+        # _representable()); None until someone checks.
+        self.columnar_safe = None
+        self._transceivers = None
+        self._df = None
+        self._arrays = None
+        self._positions = None
+        self._ranges = {}
+        self._ranked_index = None
+        self._match_indexes = {}
+        self.facets = {}
+
+    @classmethod
+    def from_columns(cls, df: pd.DataFrame, versions: np.ndarray, signature: Optional[Tuple],
+                     generation: int, seq: int, journal_entries: int) -> '_Catalog':
+        """Snapshot backed by a DataFrame loaded from the columnar file."""
+        catalog = cls(None, None, signature, generation, seq, journal_entries)
+        catalog._df = df
+        catalog._version_array = versions
+        catalog.columnar_safe = True
+        return catalog
+
+    def derive(self, records: Dict[str, Dict], versions: Dict[str, int], entries: List[Dict],
+               journal_entries: int) -> '_Catalog':
+        """Successor snapshot after ``entries`` were stored.
+
+        The search index is handed on with an overlay of the changes
+        rather than rebuilt.
+        """
+        successor = _Catalog(records, versions, _file_signature(), _next_generation(),
+                             entries[-1]['seq'], journal_entries)
+        if len(entries) == 1 and self._df is not None:
+            self._apply_to_frame(successor, entries[0])
+        ranked = self._ranked_index
+        if ranked is not None:
+            if isinstance(ranked, RankedIndex):
+                ranked = RankedOverlay(ranked)
+            ranked = ranked.updated((entry['sku'], entry.get('record')) for entry in entries)
+            if ranked.changes <= MAX_RANKED_CHANGES:
+                successor._ranked_index = ranked
+        if not all(_representable(entry['record']) for entry in entries if entry['op'] != 'delete'):
+            successor.columnar_safe = False
+        elif self.columnar_safe:
+            successor.columnar_safe = True
+        return successor
+
+    def _apply_to_frame(self, successor: '_Catalog', entry: Dict):
+        """Give ``successor`` this snapshot's DataFrame and positions with one entry applied.
+
+        Rows before and after the changed one are shared slices, so this
+        costs far less than the rebuild it saves. Entries the frame cannot
+        take as they are (a rename onto an existing SKU, a field the frame
+        lacks) leave the successor to build its own.
+        """
+        df = self._df
+        sku = entry['sku']
+        record = entry.get('record')
+        if record is None:
+            # Every later position shifts, so the successor builds its own;
+            # a scan of the column is cheaper here than building them.
+            rows = np.flatnonzero((df['sku'] == sku).to_numpy())
+            if len(rows) != 1:
+                return
+            row = int(rows[0])
+            parts = [df.iloc[:row], df.iloc[row + 1:]]
+            successor_positions = None
+        else:
+            positions = self.positions
+            row = positions.get(sku)
+            new_sku = record['sku']
+            if (row is None and entry['op'] == 'update') or (new_sku != sku and new_sku in positions):
+                return
+            df = _with_categories(df, record)
+            new = _frame_rows(record, df)
+            if new is None:
+                return
+            successor_positions = positions
+            if row is None:
+                parts = [df, new]
+                successor_positions = overlay.layered(positions)
+                successor_positions[new_sku] = len(df)
+            else:
+                parts = [df.iloc[:row], new, df.iloc[row + 1:]]
+                if new_sku != sku:
+                    successor_positions = overlay.layered(positions)
+                    del successor_positions[sku]
+                    successor_positions[new_sku] = row
+        frame = pd.concat(parts, ignore_index=True)
+        if row is not None:
+            _drop_unused_categories(frame, self.get(sku), record or {})
+        _join_chunks(frame)
+        successor._df = frame
+        successor._positions = successor_positions
+
+    def rebased(self) -> '_Catalog':
+        """The same snapshot after compaction rewrote the files; derived views are kept."""
+        successor = _Catalog(self._records, self._versions, _file_signature(), self.generation, self.seq)
+        successor._version_array = self._version_array
+        successor.columnar_safe = self.columnar_safe
+        successor._transceivers = self._transceivers
+        successor._df = self._df
+        successor._positions = self._positions
+        successor._ranges = self._ranges
+        successor._ranked_index = self._ranked_index
+        successor._match_indexes = self._match_indexes
+        successor.facets = self.facets
+        return successor
+
+    @property
+    def records(self) -> Dict[str, Dict]:
+        """SKU -> record, in catalog order."""
+        records = self._records
+        if records is None:
+            records = self._records = {
+                record['sku']: record for record in _frame_records(self.df)
+            }
+        return records
+
+    @property
+    def versions(self) -> Dict[str, int]:
+        """SKU -> version."""
+        versions = self._versions
+        if versions is None:
+            versions = self._versions = dict(zip(self.df['sku'].tolist(), self._version_array.tolist()))
+        return versions
+
+    @property
+    def count(self) -> int:
+        """Number of records."""
+        if self._records is not None:
+            return len(self._records)
+        return len(self._df)
+
+    def get(self, sku: str) -> Optional[Dict]:
+        """The record for ``sku``, read from the DataFrame if records are not built."""
+        if self._records is not None:
+            return self._records.get(sku)
+        row = self.positions.get(sku)
+        if row is None:
+            return None
+        arrays = self._arrays
+        if arrays is None:
+            df = self.df
+            arrays = self._arrays = [
+                df[column].array if column in df.columns else None for column in CATALOG_COLUMNS
+            ]
+        # Element access on the column arrays avoids building a one-row frame.
+        return {
+            column: None if array is None or pd.isna(value := array[row]) else value
+            for column, array in zip(CATALOG_COLUMNS, arrays)
+        }
+
+    def get_many(self, skus: List[str]) -> Dict[str, Dict]:
+        """SKU -> record for those of ``skus`` that exist, slicing the DataFrame once if needed."""
+        if self._records is not None:
+            records = self._records
+            return {sku: records[sku] for sku in skus if sku in records}
+        positions = self.positions
+        rows = [positions[sku] for sku in skus if sku in positions]
+        return {record['sku']: record for record in _frame_records(self.df.iloc[rows])}
+
+    @property
+    def transceivers(self) -> List[Dict]:
+        """Records as a list, built once per generation."""
+        transceivers = self._transceivers
+        if transceivers is None:
+            transceivers = self._transceivers = list(self.records.values())
+        return transceivers
+
+    @property
+    def ranked_index(self):
+        """Search index over ``df`` rows, for both ranked and filtering search.
+
+        Built on first use; a successor gets it as a RankedOverlay of the
+        changes since, which searches the same way.
+        """
+        index = self._ranked_index
+        if index is None:
+            with _index_lock, metrics.timer("catalog_build", stage="ranked_index"):
+                if self._ranked_index is None:
+                    df = self.df
+                    self._ranked_index = RankedIndex(
+                        df['sku'].tolist(), [df[field] for field in SEARCH_FIELDS if field in df.columns]
+                    )
+                index = self._ranked_index
+        return index
+
+    def search_rows(self, term: str) -> np.ndarray:
+        """Boolean row mask over ``df`` for a search term."""
+        return self.ranked_index.matches(term)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """DataFrame built on first use and shared for the whole generation."""
+        df = self._df
+        if df is None:
+            with metrics.timer("catalog_build", stage="dataframe"):
+                transceivers = self.transceivers
+                if transceivers:
+                    df = pd.DataFrame(transceivers)
+                else:
+                    df = pd.DataFrame(columns=CATALOG_COLUMNS)
+                df = self._df = _categorize(add_spec_columns(df))
+        return df
+
+    def range_index(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(row order, sorted values) for a numeric column, built once per generation.
+
+        Rows without a value are left out, so ranges and sorting skip them.
+        """
+        ranges = self._ranges.get(column)
+        if ranges is None:
+            values = self.df[column].to_numpy()
+            order = np.argsort(values, kind='stable')
+            order = order[~np.isnan(values[order])]
+            ranges = self._ranges[column] = (order, values[order])
+        return ranges
+
+    def range_rows(self, column: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        """Boolean row mask for low <= column <= high, found by binary search."""
+        order, values = self.range_index(column)
+        start = 0 if low is None else np.searchsorted(values, low, side='left')
+        end = len(values) if high is None else np.searchsorted(values, high, side='right')
+        rows = np.zeros(len(self.df), dtype=bool)
+        rows[order[start:end]] = True
+        return rows
+
+    def match_index(self, statuses: Tuple[str, ...]) -> matching.MatchIndex:
+        """Rows with one of ``statuses`` grouped for matching, built once per generation."""
+        index = self._match_indexes.get(statuses)
+        if index is None:
+            with metrics.timer("catalog_build", stage="match_index"):
+                df = self.df
+                rows = np.flatnonzero(df['status'].isin(statuses).to_numpy()) if len(df) else np.arange(0)
+                index = self._match_indexes[statuses] = matching.MatchIndex(df, rows)
+        return index
+
+    @property
+    def positions(self) -> Dict[str, int]:
+        """SKU -> row number in ``df``, built once per generation."""
+        positions = self._positions
+        if positions is None:
+            positions = self._positions = {sku: i for i, sku in enumerate(self.df['sku'].tolist())}
+        return positions
+
+    def warm(self):
+        """Build the views a catalog page uses, for a snapshot that is not published yet.
+
+        Nothing else can see the snapshot, so the indexes are built without
+        taking _index_lock and searches on the published one are not held up.
+        """
+        self.positions
+        for column in NUMERIC_COLUMNS:
+            self.range_index(column)
+        with metrics.timer("catalog_build", stage="ranked_index"):
+            self._ranked_index = RankedIndex(
+                self.df['sku'].tolist(), [self.df[field] for field in SEARCH_FIELDS if field in self.df.columns]
+            )
+        if not _use_sqlite():
+            fields = tuple(FACET_FIELDS)
+            self.facets[(fields, ())] = _facet_counts(self, fields, {})
+
+
+def _frame_records(df: pd.DataFrame) -> List[Dict]:
+    """CATALOG_COLUMNS records from catalog DataFrame rows, with missing values as None."""
+    columns = df.reindex(columns=CATALOG_COLUMNS).astype(object)
+    columns = columns.where(columns.notna(), None)
+    return [dict(zip(CATALOG_COLUMNS, row)) for row in columns.itertuples(index=False, name=None)]
+
+def _frame_rows(record: Dict, like: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """``record`` as a one-row frame with the columns and dtypes of the catalog DataFrame ``like``.
+
+    Returns None if it does not fit them as a rebuilt frame would. Facet
+    values must already be among the categories (see _with_categories()).
+    """
+    if not _representable(record) or set(like.columns) != _FRAME_COLUMNS:
+        return None
+    values = dict(record, **parse_specs(record))
+    columns = {}
+    for column in like.columns:
+        dtype = like[column].dtype
+        if dtype == object:
+            return None
+        columns[column] = pd.array([values[column]], dtype=dtype)
+    return pd.DataFrame(columns)
+
+def _with_categories(df: pd.DataFrame, record: Dict) -> pd.DataFrame:
+    """``df`` with the facet values of ``record`` added to its categories, kept sorted as a rebuild has them."""
+    for field in FACET_FIELDS:
+        column = df.get(field)
+        value = record.get(field)
+        if (isinstance(value, str) and column is not None and isinstance(column.dtype, pd.CategoricalDtype)
+                and value not in column.cat.categories):
+            df = df.assign(**{field: column.cat.set_categories(column.cat.categories.union([value]))})
+    return df
+
+def _drop_unused_categories(frame: pd.DataFrame, old: Dict, new: Dict):
+    """Remove facet values of a replaced or deleted record that no row of ``frame`` uses any more."""
+    for field in FACET_FIELDS:
+        value = old.get(field)
+        if value is None or value == new.get(field) or not isinstance(frame[field].dtype, pd.CategoricalDtype):
+            continue
+        if not (frame[field] == value).any():
+            frame[field] = frame[field].cat.remove_categories([value])
+
+def _join_chunks(frame: pd.DataFrame):
+    """Join Arrow-backed text columns that concatenating slices left in chunks.
+
+    Row selection on a chunked column is about half as fast, and it is
+    cheaper to join once per write than to pay that on every read.
+    """
+    for column in CATALOG_COLUMNS:
+        array = frame[column].array
+        if getattr(array.dtype, 'storage', None) != 'pyarrow':
+            continue
+        chunks = array.__arrow_array__()
+        if chunks.num_chunks > 1:
+            frame[column] = pd.array(chunks.combine_chunks(), dtype=array.dtype)
+
+def _representable(record: Dict) -> bool:
+    """Whether the columnar file holds ``record`` exactly: all of CATALOG_COLUMNS, nothing else, text or None."""
+    return record.keys() == _CATALOG_KEYS and all(v is None or isinstance(v, str) for v in record.values())
+
+def _categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Store the low-cardinality facet columns as categoricals."""
+    for field in FACET_FIELDS:
+        if field in df.columns:
+            df[field] = df[field].astype('category')
+    return df
+
+def _next_generation() -> int:
+    global _generation
+    with _lock:
+        _generation += 1
+        return _generation
+
 def ensure_data_file():
     """Ensure the data file exists."""
     if not os.path.exists(DATA_FILE):
@@ -12,78 +496,1035 @@ def ensure_data_file():
         with open(DATA_FILE, 'w') as f:
             json.dump([], f)
 
-def load_transceivers() -> List[Dict]:
-    """Load all transceivers from the data file."""
+def _stat(path: str) -> Optional[Tuple]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _use_sqlite() -> bool:
+    return STORAGE_BACKEND == "sqlite"
+
+@contextmanager
+def _writer():
+    """Serialize writers: _lock within the process, an exclusive flock across processes.
+
+    The lock file sits next to the active store. Nested use in one thread
+    takes the file lock only once.
+    """
+    global _write_depth
+    with _lock:
+        if _write_depth or fcntl is None:
+            _write_depth += 1
+            try:
+                yield
+            finally:
+                _write_depth -= 1
+            return
+        lock_path = (SQLITE_FILE if _use_sqlite() else DATA_FILE) + ".lock"
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        with open(lock_path, 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            _write_depth += 1
+            try:
+                yield
+            finally:
+                _write_depth -= 1
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _sqlite():
+    """Return this thread's database connection, migrating from DATA_FILE on first use."""
+    os.makedirs(os.path.dirname(SQLITE_FILE), exist_ok=True)
+    conn = sqlite_store.connect(SQLITE_FILE)
+    if not sqlite_store.is_migrated(conn):
+        with _writer():
+            if not sqlite_store.is_migrated(conn):
+                records, versions, seq, _, _ = _read_json_source()
+                sqlite_store.replace_all(conn, records.values(), seq, versions)
+    return conn
+
+def _file_signature() -> Optional[Tuple]:
+    """Return a value that changes whenever the stored catalog changes.
+
+    For the JSON backend this is (mtime, size) of the data file and journal,
+    or None if the data file is missing; for SQLite it is the change number.
+    """
+    if _use_sqlite():
+        return ('sqlite', sqlite_store.get_seq(_sqlite()))
+    data = _stat(DATA_FILE)
+    if data is None:
+        return None
+    return (data, _stat(JOURNAL_FILE))
+
+def _apply(records: Dict[str, Dict], versions: Dict[str, int], entry: Dict):
+    """Apply one journal entry to a SKU->record mapping and its SKU->version map.
+
+    Entries carry the full record, so applying one twice is harmless; this
+    keeps replay correct if a crash interrupts compaction.
+    """
+    op = entry['op']
+    sku = entry['sku']
+    if op == 'add':
+        records[sku] = entry['record']
+        versions[sku] = entry['seq']
+    elif op == 'update':
+        record = entry['record']
+        new_sku = record['sku']
+        if new_sku == sku or sku not in records:
+            records[new_sku] = record
+        else:
+            # A renamed SKU keeps its position, which needs a rebuild.
+            items = [(new_sku, record) if k == sku else (k, v) for k, v in records.items()]
+            records.clear()
+            records.update(items)
+            versions.pop(sku, None)
+        versions[new_sku] = entry['seq']
+    elif op == 'delete':
+        records.pop(sku, None)
+        versions.pop(sku, None)
+
+def _read_journal() -> Tuple[List[Dict], Dict, bool]:
+    """Return (entries, checkpoint, torn) from the journal.
+
+    The checkpoint is the header written by compaction, holding the change
+    number of the snapshot, the versions of its records and the signature
+    of the data file it goes with. Entries kept when a replaced data file
+    was renumbered (see _renumber_data_file()) may be older than it.
+    """
+    entries = []
+    checkpoint = {'seq': 0, 'op': 'checkpoint'}
+    try:
+        f = open(JOURNAL_FILE, 'r')
+    except FileNotFoundError:
+        return entries, checkpoint, False
+    with f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Torn final append from a crash; nothing after it was acknowledged.
+                return entries, checkpoint, True
+            if entry['op'] == 'checkpoint':
+                checkpoint = entry
+            else:
+                entries.append(entry)
+    return entries, checkpoint, False
+
+def _data_file_replaced() -> bool:
+    """Return True if DATA_FILE is not the file the journal checkpoint was written with."""
+    try:
+        with open(JOURNAL_FILE, 'r') as f:
+            checkpoint = json.loads(f.readline())
+    except (FileNotFoundError, ValueError):
+        checkpoint = {}
+    if checkpoint.get('op') != 'checkpoint':
+        checkpoint = {}
+    return checkpoint.get('data') != _signature_key(_stat(DATA_FILE))
+
+def _renumber_data_file():
+    """Record a data file replaced outside this module as a new change. Caller must be in _writer().
+
+    The journal gets a checkpoint with the next change number, which every
+    record in the new file takes as its version, so get_catalog_version()
+    moves on and changes_since() sends mirrors a snapshot. Journal entries
+    are kept and still replayed over the new file.
+    """
+    data = _stat(DATA_FILE)
+    with open(DATA_FILE, 'r') as f:
+        skus = [t['sku'] for t in json.load(f)]
+    entries, checkpoint, _ = _read_journal()
+    seq = max([checkpoint['seq']] + [entry['seq'] for entry in entries]) + 1
+    checkpoint = {'seq': seq, 'op': 'checkpoint', 'versions': dict.fromkeys(skus, seq), 'data': data}
+    lines = [checkpoint] + entries
+    _write_atomic(JOURNAL_FILE, lambda f: f.writelines(json.dumps(line) + "\n" for line in lines))
+
+def _read_json_source() -> Tuple[Dict[str, Dict], Dict[str, int], int, int, bool]:
+    """Read the snapshot and replay the journal.
+
+    Returns (records, versions, seq, journal entry count, torn journal flag).
+    Records written before versions were tracked have version 0.
+    """
     ensure_data_file()
     with open(DATA_FILE, 'r') as f:
-        return json.load(f)
+        records = {t['sku']: t for t in json.load(f)}
+    entries, checkpoint, torn = _read_journal()
+    saved = checkpoint.get('versions', {})
+    versions = {sku: saved.get(sku, 0) for sku in records}
+    seq = checkpoint['seq']
+    for entry in entries:
+        _apply(records, versions, entry)
+        seq = max(seq, entry['seq'])
+    return records, versions, seq, len(entries), torn
 
-def save_transceivers(transceivers: List[Dict]):
-    """Save transceivers to the data file."""
+def _read_catalog() -> _Catalog:
+    """Read the stored catalog into a new, unpublished snapshot."""
+    if _use_sqlite():
+        conn = _sqlite()
+        with sqlite_store.snapshot(conn):
+            signature = _file_signature()
+            records = {t['sku']: t for t in sqlite_store.load_all(conn)}
+            versions = sqlite_store.load_versions(conn)
+        return _Catalog(records, versions, signature, _next_generation(), signature[1])
+
+    ensure_data_file()
+    catalog = _read_columnar(_file_signature())
+    if catalog is not None:
+        return catalog
+    if SHARED_CATALOG:
+        with _writer():
+            return _read_columnar(_file_signature()) or _parse_catalog()
+    return _parse_catalog()
+
+def _parse_catalog() -> _Catalog:
+    """Read the JSON snapshot and journal into a new snapshot, refreshing COLUMNAR_FILE.
+
+    A data file replaced outside this module is first given a change number
+    of its own; if the journal cannot be written, it is served as it is.
+    """
+    if _data_file_replaced():
+        try:
+            with _writer():
+                if _data_file_replaced():
+                    _renumber_data_file()
+        except OSError:
+            pass
+    # Another process may replace the snapshot and journal between our two
+    # reads; if the files changed underneath us, read them again.
+    for _ in range(LOAD_RETRIES):
+        signature = _file_signature()
+        records, versions, seq, journal_entries, torn = _read_json_source()
+        stable = _file_signature() == signature
+        if stable:
+            break
+    catalog = _Catalog(records, versions, signature, _next_generation(), seq, journal_entries)
+    catalog.journal_torn = torn
+    if stable and not torn:
+        catalog = _write_columnar(catalog)
+    return catalog
+
+def _load_catalog() -> _Catalog:
+    """Read the stored catalog and install it as the cache. Caller must hold _lock."""
+    return _publish(_read_catalog())
+
+def _signature_key(signature: Optional[Tuple]) -> Optional[List]:
+    """A file signature in the form it takes after a JSON round trip."""
+    return json.loads(json.dumps(signature))
+
+def _read_columnar(signature: Optional[Tuple]) -> Optional[_Catalog]:
+    """Load COLUMNAR_FILE if it was built from the data files as they are now."""
+    loaded = columnar.load(COLUMNAR_FILE)
+    if loaded is None:
+        return None
+    header, df, versions = loaded
+    if header.get('signature') != _signature_key(signature):
+        return None
+    return _Catalog.from_columns(df, versions, signature, _next_generation(),
+                                 header['seq'], header['journal_entries'])
+
+def _write_columnar(catalog: _Catalog) -> _Catalog:
+    """Rewrite COLUMNAR_FILE from a catalog whose signature matches the data files.
+
+    Returns the snapshot to serve: with SHARED_CATALOG, the one mapped from
+    the new file (keeping the generation and search indexes), otherwise
+    ``catalog``. The file is only a cache, so failing to write it is not an
+    error, and a catalog it cannot hold exactly is left to the JSON files.
+    """
+    if _use_sqlite() or catalog.signature is None:
+        return catalog
+    if catalog.columnar_safe is None:
+        catalog.columnar_safe = all(map(_representable, catalog.records.values()))
+    if not catalog.columnar_safe:
+        return catalog
+    df = catalog.df
+    if catalog._versions is None and catalog._version_array is not None:
+        versions = catalog._version_array
+    else:
+        versions = [catalog.versions.get(sku, 0) for sku in df['sku'].tolist()]
+    meta = {
+        'signature': _signature_key(catalog.signature),
+        'seq': catalog.seq,
+        'journal_entries': catalog.journal_entries,
+    }
+    try:
+        with metrics.timer("catalog_build", stage="columnar"):
+            written = columnar.write(COLUMNAR_FILE, df, CATALOG_COLUMNS, NUMERIC_COLUMNS, versions, meta)
+    except OSError:
+        return catalog
+    shared = _read_columnar(catalog.signature) if written and SHARED_CATALOG else None
+    if shared is None:
+        return catalog
+    shared.generation = catalog.generation
+    shared._ranked_index = catalog._ranked_index
+    return shared
+
+def _write_atomic(path: str, write):
+    """Write a file through a temporary sibling and rename it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            columnar.match_mode(f.fileno(), path)
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _write_snapshot(transceivers: List[Dict], versions: Dict[str, int], seq: int):
+    """Atomically replace the data file and reset the journal to a checkpoint."""
     ensure_data_file()
-    with open(DATA_FILE, 'w') as f:
-        json.dump(transceivers, f, indent=2)
+    _write_atomic(DATA_FILE, lambda f: json.dump(transceivers, f, indent=2))
+    checkpoint = {'seq': seq, 'op': 'checkpoint', 'versions': {k: v for k, v in versions.items() if v},
+                  'data': _stat(DATA_FILE)}
+    _write_atomic(JOURNAL_FILE, lambda f: f.write(json.dumps(checkpoint) + "\n"))
+
+def _append_journal(entry: Dict):
+    """Durably append one entry to the journal."""
+    with open(JOURNAL_FILE, 'a') as f:
+        f.write(json.dumps(entry) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def _publish(catalog: _Catalog) -> _Catalog:
+    global _catalog
+    _catalog = catalog
+    return catalog
+
+def _changed_fields(old: Dict, new: Dict) -> List[str]:
+    """Fields whose value differs between two versions of a record."""
+    return [field for field in dict.fromkeys(list(new) + list(old)) if old.get(field) != new.get(field)]
+
+def _change_record(entry: Dict) -> Dict:
+    """Compact form of a journal entry for change feeds: op, SKU and changed fields only.
+
+    Entries written before ``fields`` was recorded report every field.
+    """
+    change = {'version': entry['seq'], 'op': entry['op'], 'sku': entry['sku']}
+    if entry['op'] != 'delete':
+        record = entry['record']
+        change['changes'] = {field: record.get(field) for field in entry.get('fields', record)}
+    return change
+
+def _commit(catalog: _Catalog, op: str, sku: str, record: Optional[Dict] = None):
+    """Store a mutation and publish the resulting snapshot. Caller must be in _writer()."""
+    entry = {'seq': catalog.seq + 1, 'op': op, 'sku': sku}
+    if record is not None:
+        entry['record'] = dict(record)
+    if op == 'update':
+        entry['fields'] = _changed_fields(catalog.records[sku], entry['record'])
+    records = overlay.layered(catalog.records)
+    versions = overlay.layered(catalog.versions)
+    _apply(records, versions, entry)
+    try:
+        if _use_sqlite():
+            sqlite_store.apply(_sqlite(), entry)
+        else:
+            if catalog.journal_torn:
+                # Appending after a torn line would hide the new entry from replay.
+                catalog = _compact(catalog)
+            _append_journal(entry)
+    except Exception:
+        invalidate_cache()
+        raise
+    catalog = _publish(catalog.derive(records, versions, [entry], catalog.journal_entries + 1))
+    if not _use_sqlite() and catalog.journal_entries >= JOURNAL_COMPACT_THRESHOLD:
+        _compact(catalog)
+    elif SHARED_CATALOG:
+        _publish(_write_columnar(catalog))
+
+def _commit_batch(catalog: _Catalog, entries: List[Dict]):
+    """Apply many mutations with a single atomic write. Caller must be in _writer().
+
+    Entries must be numbered from ``catalog.seq + 1``. The JSON backend
+    writes a new snapshot and resets the journal; SQLite applies them in one
+    transaction.
+    """
+    if not entries:
+        return
+    records = dict(catalog.records)
+    versions = dict(catalog.versions)
+    for entry in entries:
+        _apply(records, versions, entry)
+    try:
+        if _use_sqlite():
+            sqlite_store.apply_many(_sqlite(), entries)
+        else:
+            _write_snapshot(list(records.values()), versions, entries[-1]['seq'])
+    except Exception:
+        invalidate_cache()
+        raise
+    catalog = _publish(catalog.derive(records, versions, entries, 0))
+    _publish(_write_columnar(catalog))
+
+def _get_catalog() -> _Catalog:
+    """Return the current snapshot, reloading it if the data files changed.
+
+    While another thread is writing or reloading, readers keep using the
+    last published snapshot instead of waiting. With the watcher running
+    (see start_watcher()) only writers reload; readers take the published
+    snapshot as it is.
+    """
+    catalog = _catalog
+    if catalog is not None and _watcher is not None and not _write_depth:
+        # The watcher thread picks up changes; readers never reload inline.
+        return catalog
+    signature = _file_signature()
+    if catalog is not None and signature is not None and catalog.signature == signature:
+        return catalog
+
+    if not _lock.acquire(blocking=catalog is None):
+        return catalog
+    try:
+        if _catalog is not None and signature is not None and _catalog.signature == signature:
+            return _catalog
+        with metrics.timer("catalog_build", stage="load"):
+            return _load_catalog()
+    finally:
+        _lock.release()
+
+def get_catalog_generation() -> int:
+    """Return a counter that changes whenever the catalog contents change."""
+    return _get_catalog().generation
+
+def get_catalog_version() -> int:
+    """Return the change number of the last write, shared by every process.
+
+    Under SQLite this is read from the database without loading the catalog.
+    """
+    if _use_sqlite():
+        return sqlite_store.get_seq(_sqlite())
+    return _get_catalog().seq
+
+def get_catalog_tag() -> str:
+    """Return a string that changes whenever the served catalog changes, for cache validators.
+
+    It is the change number plus the signature of the data files the
+    snapshot was read from, so a data file replaced outside this module
+    (a sync job, say) changes it too. File signatures are the same in every
+    process, and so is the tag.
+    """
+    if _use_sqlite():
+        return f"sqlite:{get_catalog_version()}"
+    catalog = _get_catalog()
+    return f"{catalog.seq}:{_signature_key(catalog.signature)}"
+
+@metrics.timed("data_manager")
+def changes_since(version: int) -> Dict:
+    """Get what changed after catalog version ``version``, for keeping a copy in sync.
+
+    Returns ``version``, the catalog version the result brings a client up
+    to, and ``changes``, one {"version", "op", "sku", "changes"} record per
+    mutation in order. For adds ``changes`` holds the whole record, for
+    updates only the fields that changed (a renamed SKU shows up as a
+    changed ``sku``), and deletes have none. ``snapshot`` is None, unless
+    the changes since ``version`` are no longer kept (compaction, bulk
+    imports and save_transceivers() drop them) or ``version`` is unknown:
+    then it holds every record and ``changes`` is empty. Pass -1 to start
+    from a snapshot.
+    """
+    if _use_sqlite():
+        logged = sqlite_store.changes_since(_sqlite(), version)
+    else:
+        # Loading the catalog gives a replaced data file its own change number.
+        _get_catalog()
+        entries, checkpoint, _ = _read_journal()
+        latest = max([checkpoint['seq']] + [entry['seq'] for entry in entries])
+        if checkpoint['seq'] <= version <= latest:
+            logged = (latest, [_change_record(e) for e in entries if e['seq'] > version])
+        else:
+            logged = None
+    if logged is not None:
+        latest, changes = logged
+        return {'version': latest, 'changes': changes, 'snapshot': None}
+    catalog = _get_catalog()
+    return {'version': catalog.seq, 'changes': [], 'snapshot': [dict(t) for t in catalog.transceivers]}
+
+def _reload(signature: Optional[Tuple]) -> Optional[_Catalog]:
+    """Read and warm a new snapshot off the request path, then swap it in.
+
+    The snapshot is dropped if the files changed again while it was being
+    built, or a writer in this process has published since. Returns the
+    snapshot if it was published.
+    """
+    with metrics.timer("catalog_build", stage="reload"):
+        catalog = _read_catalog()
+        catalog.warm()
+    with _lock:
+        if catalog.signature != signature or _file_signature() != signature:
+            return None
+        if _catalog is not None and _catalog.signature == signature:
+            return None
+        return _publish(catalog)
+
+def _watch(interval: float, stop: threading.Event):
+    """Watcher thread body: poll the data files and reload when they change.
+
+    A catalog that fails to load leaves the last good snapshot in place;
+    the same files are not retried until they change again.
+    """
+    failed = None
+    while not stop.wait(interval):
+        try:
+            signature = _file_signature()
+            catalog = _catalog
+            if signature is None or signature == failed or (catalog is not None and catalog.signature == signature):
+                continue
+            catalog = _reload(signature)
+            if catalog is not None:
+                _watcher_status.pop('last_error', None)
+                _watcher_status.pop('last_error_time', None)
+                _watcher_status.update(last_reload=time.time(), generation=catalog.generation)
+                metrics.increment("catalog_reloads", result="ok")
+            failed = None
+        except Exception as e:
+            failed = signature
+            _watcher_status.update(last_error=f"{type(e).__name__}: {e}", last_error_time=time.time())
+            metrics.increment("catalog_reloads", result="error")
+
+def start_watcher(interval: float = WATCH_INTERVAL):
+    """Reload the catalog in a background thread whenever the data files change.
+
+    Readers then always get the last published snapshot without checking
+    the files or waiting for a reload, and a data file that cannot be read
+    (a half-finished sync, say) keeps the last good catalog in service.
+    The catalog is loaded before this returns. Later calls are no-ops.
+    """
+    global _watcher, _watcher_stop
+    with _lock:
+        if _watcher is not None:
+            return
+        _get_catalog()
+        _watcher_stop = threading.Event()
+        _watcher_status.clear()
+        _watcher_status.update(interval=interval, started=time.time())
+        _watcher = threading.Thread(target=_watch, args=(interval, _watcher_stop),
+                                    name="catalog-watcher", daemon=True)
+        _watcher.start()
+
+def stop_watcher():
+    """Stop the background watcher; readers go back to checking the files themselves."""
+    global _watcher
+    with _lock:
+        watcher, _watcher = _watcher, None
+        if watcher is None:
+            return
+        _watcher_stop.set()
+    watcher.join()
+
+def get_watcher_status() -> Optional[Dict]:
+    """Interval, start time and last reload or error of the watcher, or None if it is not running."""
+    if _watcher is None:
+        return None
+    return dict(_watcher_status)
+
+def invalidate_cache():
+    """Drop the cached catalog so the next read reparses the data files."""
+    global _catalog, _sqlite_facets
+    with _lock:
+        _catalog = None
+        _sqlite_facets = (None, {})
+
+def _compact(catalog: _Catalog) -> _Catalog:
+    """Fold the journal into the data file. Caller must be in _writer()."""
+    if _use_sqlite():
+        return catalog
+    _write_snapshot(list(catalog.records.values()), catalog.versions, catalog.seq)
+    catalog = _publish(catalog.rebased())
+    return _publish(_write_columnar(catalog))
+
+@metrics.timed("data_manager")
+def compact_journal():
+    """Fold the journal into the data file and truncate it."""
+    with _writer():
+        _compact(_get_catalog())
+
+@metrics.timed("data_manager")
+def load_transceivers() -> List[Dict]:
+    """Load all transceivers from the data file."""
+    return [dict(t) for t in _get_catalog().transceivers]
+
+@metrics.timed("data_manager")
+def save_transceivers(transceivers: List[Dict]):
+    """Replace the whole catalog; every record gets a new version."""
+    with _writer():
+        seq = _get_catalog().seq + 1
+        records = {t['sku']: dict(t) for t in transceivers}
+        versions = {sku: seq for sku in records}
+        if _use_sqlite():
+            sqlite_store.replace_all(_sqlite(), records.values(), seq, versions)
+        else:
+            _write_snapshot(list(records.values()), versions, seq)
+        catalog = _publish(_Catalog(records, versions, _file_signature(), _next_generation(), seq))
+        _publish(_write_columnar(catalog))
 
+def _check_version(catalog: _Catalog, sku: str, expected_version: Optional[int]):
+    """Raise ConcurrentModificationError if ``sku`` is no longer at ``expected_version``."""
+    if expected_version is None:
+        return
+    current = catalog.versions.get(sku)
+    if current != expected_version:
+        if current is None:
+            raise ConcurrentModificationError(f"{sku} was deleted by another user")
+        raise ConcurrentModificationError(
+            f"{sku} was changed by another user (version {current}, expected {expected_version})"
+        )
+
+@metrics.timed("data_manager")
 def add_transceiver(transceiver: Dict) -> bool:
     """Add a new transceiver."""
-    transceivers = load_transceivers()
+    with _writer():
+        catalog = _get_catalog()
 
-    # Check if SKU already exists
-    if any(t['sku'] == transceiver['sku'] for t in transceivers):
-        return False
+        # Check if SKU already exists
+        if transceiver['sku'] in catalog.records:
+            return False
 
-    transceivers.append(transceiver)
-    save_transceivers(transceivers)
-    return True
+        _commit(catalog, 'add', transceiver['sku'], transceiver)
+        return True
 
-def update_transceiver(sku: str, updated_data: Dict) -> bool:
-    """Update an existing transceiver by SKU."""
-    transceivers = load_transceivers()
+@metrics.timed("data_manager")
+def update_transceiver(sku: str, updated_data: Dict, expected_version: Optional[int] = None) -> bool:
+    """Update an existing transceiver by SKU.
 
-    for i, t in enumerate(transceivers):
-        if t['sku'] == sku:
-            transceivers[i] = updated_data
-            save_transceivers(transceivers)
-            return True
+    With ``expected_version`` (from get_transceiver_version()) the update is
+    refused with ConcurrentModificationError if the record changed since.
+    """
+    with _writer():
+        catalog = _get_catalog()
+        _check_version(catalog, sku, expected_version)
+        if sku not in catalog.records:
+            return False
 
-    return False
+        new_sku = updated_data.get('sku', sku)
+        if new_sku != sku and new_sku in catalog.records:
+            return False
 
-def delete_transceiver(sku: str) -> bool:
-    """Delete a transceiver by SKU."""
-    transceivers = load_transceivers()
-    initial_length = len(transceivers)
+        _commit(catalog, 'update', sku, dict(updated_data, sku=new_sku))
+        return True
 
-    transceivers = [t for t in transceivers if t['sku'] != sku]
+@metrics.timed("data_manager")
+def delete_transceiver(sku: str, expected_version: Optional[int] = None) -> bool:
+    """Delete a transceiver by SKU, optionally only if it is still at ``expected_version``."""
+    with _writer():
+        catalog = _get_catalog()
+        _check_version(catalog, sku, expected_version)
+        if sku not in catalog.records:
+            return False
 
-    if len(transceivers) < initial_length:
-        save_transceivers(transceivers)
+        _commit(catalog, 'delete', sku)
         return True
 
-    return False
+def validate_transceiver(transceiver: Dict) -> List[str]:
+    """Return a list of problems with a record; empty when it is valid."""
+    errors = []
+    missing = [field for field in CATALOG_COLUMNS if not str(transceiver.get(field) or "").strip()]
+    if missing:
+        errors.append(f"Missing required fields: {', '.join(missing)}")
+    for field, choices in FIELD_CHOICES.items():
+        value = transceiver.get(field)
+        if value and value not in choices:
+            errors.append(f"Invalid {field} '{value}' (expected one of: {', '.join(choices)})")
+    return errors
+
+@metrics.timed("data_manager")
+def bulk_upsert_transceivers(transceivers: List[Dict]) -> Dict[str, int]:
+    """Add or replace many transceivers by SKU in one atomic commit.
+
+    Returns counts of added, updated and unchanged records.
+    """
+    counts = {'added': 0, 'updated': 0, 'unchanged': 0}
+    with _writer():
+        catalog = _get_catalog()
+        entries = []
+        for transceiver in transceivers:
+            record = {field: transceiver.get(field) for field in CATALOG_COLUMNS}
+            sku = record['sku']
+            existing = catalog.records.get(sku)
+            if existing == record:
+                counts['unchanged'] += 1
+                continue
+            entry = {'seq': catalog.seq + len(entries) + 1, 'op': 'add', 'sku': sku, 'record': record}
+            if existing is None:
+                counts['added'] += 1
+            else:
+                counts['updated'] += 1
+                entry.update(op='update', fields=_changed_fields(existing, record))
+            entries.append(entry)
+        _commit_batch(catalog, entries)
+    return counts
+
+@metrics.timed("data_manager")
+def import_transceivers(source, file_format: Optional[str] = None, dry_run: bool = False) -> Dict:
+    """Import transceivers from a CSV or XLSX file, upserting by SKU.
 
+    Rows are streamed from ``source`` (a path or binary file object) and
+    validated like the admin forms. Valid rows are committed together in one
+    atomic write; invalid rows are skipped and reported. With ``dry_run``
+    nothing is written.
+
+    Returns a dict with ``added``, ``updated`` and ``unchanged`` counts and
+    ``errors``, a list of {"row", "sku", "error"} dicts.
+    """
+    valid = {}
+    errors = []
+    for row_number, row in importer.iter_rows(source, file_format):
+        record = {field: row.get(field, "") for field in CATALOG_COLUMNS}
+        problems = validate_transceiver(record)
+        if not problems and record['sku'] in valid:
+            problems = [f"Duplicate SKU (first seen on row {valid[record['sku']][0]})"]
+        if problems:
+            errors.extend({'row': row_number, 'sku': record['sku'], 'error': p} for p in problems)
+            continue
+        valid[record['sku']] = (row_number, record)
+
+    records = [record for _, record in valid.values()]
+    if dry_run:
+        catalog = _get_catalog()
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0}
+        for record in records:
+            current = catalog.get(record['sku'])
+            key = 'added' if current is None else ('unchanged' if current == record else 'updated')
+            counts[key] += 1
+    else:
+        counts = bulk_upsert_transceivers(records)
+    return dict(counts, errors=errors)
+
+@metrics.timed("data_manager")
 def get_transceiver(sku: str) -> Optional[Dict]:
     """Get a specific transceiver by SKU."""
-    transceivers = load_transceivers()
+    if _use_sqlite():
+        return sqlite_store.get(_sqlite(), sku)
+    t = _get_catalog().get(sku)
+    return dict(t) if t is not None else None
+
+@metrics.timed("data_manager")
+def get_transceivers(skus: Iterable[str]) -> Dict:
+    """Resolve many SKUs at once, e.g. the lines of a bill of materials.
+
+    Returns ``found`` (SKU -> record, in first-seen order), ``missing``
+    (SKUs not in the catalog) and ``inactive`` (found SKUs whose status is
+    not Active). Repeated SKUs are resolved once.
+    """
+    skus = list(dict.fromkeys(skus))
+    if _use_sqlite():
+        records = sqlite_store.get_many(_sqlite(), skus)
+    else:
+        records = _get_catalog().get_many(skus)
+    found = {}
+    missing = []
+    for sku in skus:
+        record = records.get(sku)
+        if record is None:
+            missing.append(sku)
+        else:
+            found[sku] = dict(record)
+    return {
+        'found': found,
+        'missing': missing,
+        'inactive': [sku for sku, record in found.items() if record.get('status') != 'Active'],
+    }
 
-    for t in transceivers:
-        if t['sku'] == sku:
-            return t
+def get_transceiver_version(sku: str) -> Optional[int]:
+    """Get the version of a transceiver, to pass back to update or delete."""
+    return _get_catalog().versions.get(sku)
 
-    return None
+def get_transceiver_count() -> int:
+    """Get the number of transceivers in the catalog."""
+    if _use_sqlite():
+        return sqlite_store.count(_sqlite())
+    return _get_catalog().count
 
+@metrics.timed("data_manager")
 def get_transceivers_df() -> pd.DataFrame:
     """Get transceivers as a pandas DataFrame."""
-    transceivers = load_transceivers()
-    if not transceivers:
-        return pd.DataFrame(columns=[
-            'sku', 'name', 'form_factor', 'data_rate', 'wavelength',
-            'reach', 'connector', 'temperature', 'power', 'description', 'status'
-        ])
-    return pd.DataFrame(transceivers)
+    return _get_catalog().df.copy(deep=not _COPY_ON_WRITE)
 
+@metrics.timed("data_manager")
 def get_unique_values(field: str) -> List[str]:
     """Get unique values for a specific field."""
-    df = get_transceivers_df()
+    if _use_sqlite():
+        return sqlite_store.distinct(_sqlite(), field)
+    df = _get_catalog().df
     if field in df.columns:
         return sorted(df[field].dropna().unique().tolist())
     return []
+
+def normalize_criteria(criteria: Optional[Dict]) -> Dict:
+    """Drop empty and "All" entries from filter criteria and validate the rest.
+
+    Facet fields take a value or a list of accepted values, numeric spec
+    columns a (min, max) tuple with None for an open end, and ``search`` a
+    search term.
+    """
+    normalized = {}
+    for field, value in (criteria or {}).items():
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"Unknown filter field: {field}")
+        if value is None or value == "" or value == "All":
+            continue
+        if field in NUMERIC_COLUMNS:
+            low, high = value
+            value = (None if low is None else float(low), None if high is None else float(high))
+            if value == (None, None):
+                continue
+        elif field != 'search' and not isinstance(value, str):
+            value = tuple(sorted(set(value)))
+            if not value:
+                continue
+        normalized[field] = value
+    return normalized
+
+def _search_rows(catalog: _Catalog, term: str) -> np.ndarray:
+    """Boolean row mask over the catalog DataFrame for a search term."""
+    if catalog.df.empty:
+        return np.zeros(0, dtype=bool)
+    return catalog.search_rows(term)
+
+def _mismatches(catalog: _Catalog, criteria: Dict) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Evaluate normalized criteria against the catalog DataFrame.
+
+    Returns the mask of rows passing the search and range criteria and, per
+    facet criterion, a boolean array of rows that fail it. Facet columns are
+    categorical, so each comparison runs on the integer codes.
+    """
+    df = catalog.df
+    if 'search' in criteria:
+        base_ok = _search_rows(catalog, criteria['search'])
+    else:
+        base_ok = np.ones(len(df), dtype=bool)
+
+    failed = {}
+    for field, value in criteria.items():
+        if field == 'search':
+            continue
+        if field in NUMERIC_COLUMNS:
+            base_ok &= catalog.range_rows(field, *value)
+            continue
+        column = df[field]
+        codes = column.cat.codes.to_numpy()
+        wanted = column.cat.categories.get_indexer([value] if isinstance(value, str) else list(value))
+        wanted = wanted[wanted >= 0]
+        if len(wanted) == 1:
+            failed[field] = codes != wanted[0]
+        else:
+            failed[field] = ~np.isin(codes, wanted)
+    return base_ok, failed
+
+@metrics.timed("data_manager")
+def get_facets(fields: Optional[List[str]] = None,
+               current_filters: Optional[Dict] = None) -> Dict[str, List[Tuple[str, int]]]:
+    """Get (value, count) pairs for each facet field, sorted by value.
+
+    ``current_filters`` takes the same criteria as filter_transceivers(),
+    including a free-text 'search' key. Counts for a field honour every active filter except the one on that
+    field itself, so they show how many results picking each value would
+    give. Values with no results are left out. Results are cached until
+    the catalog changes. Under SQLite they are GROUP BY queries on the
+    indexed columns, without loading the catalog.
+    """
+    fields = tuple(fields or FACET_FIELDS)
+    current_filters = normalize_criteria(current_filters)
+    if _use_sqlite():
+        catalog, cache = None, _sqlite_facet_cache(_file_signature())
+    else:
+        catalog = _get_catalog()
+        cache = catalog.facets
+    key = (fields, tuple(sorted(current_filters.items())))
+    facets = cache.get(key)
+    if facets is not None:
+        metrics.increment("facet_cache_requests", result="hit")
+        return facets
+    metrics.increment("facet_cache_requests", result="miss")
+
+    if catalog is None:
+        facets = sqlite_store.facet_counts(_sqlite(), fields, current_filters)
+    else:
+        facets = _facet_counts(catalog, fields, current_filters)
+
+    if len(cache) >= FACET_CACHE_SIZE:
+        cache.clear()
+    cache[key] = facets
+    return facets
+
+def _sqlite_facet_cache(signature: Tuple) -> Dict:
+    """The SQLite facet results cached for the database at ``signature``, emptied when it moves on."""
+    global _sqlite_facets
+    if _sqlite_facets[0] != signature:
+        _sqlite_facets = (signature, {})
+    return _sqlite_facets[1]
+
+def _facet_counts(catalog: _Catalog, fields: Tuple[str, ...],
+                  current_filters: Dict) -> Dict[str, List[Tuple[str, int]]]:
+    """Compute facet counts from the catalog DataFrame."""
+    df = catalog.df
+    if df.empty:
+        return {field: [] for field in fields}
+
+    # A row counts towards a field's facet if it passes every filter, or if
+    # the only filter it fails is the one on that field.
+    base_ok, failed = _mismatches(catalog, current_filters)
+    fail_count = sum(f.astype(np.int8) for f in failed.values()) if failed else 0
+
+    facets = {}
+    for field in fields:
+        if field not in df.columns:
+            facets[field] = []
+            continue
+        if field in failed:
+            rows = base_ok & ((fail_count - failed[field]) == 0)
+        else:
+            rows = base_ok & (fail_count == 0)
+        column = df[field]
+        codes = column.cat.codes.to_numpy()[rows]
+        counts = np.bincount(codes[codes >= 0], minlength=len(column.cat.categories))
+        facets[field] = sorted(
+            (value, int(n)) for value, n in zip(column.cat.categories, counts) if n
+        )
+    return facets
+
+@metrics.timed("data_manager")
+def search_transceivers(term: str) -> List[str]:
+    """Get SKUs matching a search term, in catalog order.
+
+    Every token of the term must prefix-match a word in the SKU, name or
+    description. The term is taken literally, never as a pattern.
+    """
+    catalog = _get_catalog()
+    return catalog.df['sku'][_search_rows(catalog, term)].tolist()
+
+@metrics.timed("data_manager")
+def rank_transceivers(query: str, criteria: Optional[Dict] = None, limit: int = 10) -> List[Tuple[str, float]]:
+    """Get the ``limit`` SKUs that best match a query, as (SKU, score) pairs, best first.
+
+    Unlike search_transceivers() this tolerates typos and partial words
+    and ranks rather than filters: rare terms count for more, and a SKU
+    equal to or starting with the query ranks above any text match.
+    ``criteria`` (as for filter_transceivers()) limits the candidates.
+    """
+    criteria = normalize_criteria(criteria)
+    catalog = _get_catalog()
+    if catalog.df.empty:
+        return []
+    allowed = None
+    if criteria:
+        allowed = np.zeros(len(catalog.df), dtype=bool)
+        allowed[_matching_rows(catalog, criteria, None)] = True
+    ranked = catalog.ranked_index.search(query, limit, allowed)
+    # Only the returned rows' SKUs are looked up, not the whole column.
+    skus = catalog.df['sku'].iloc[[row for row, _ in ranked]].tolist()
+    return [(sku, score) for sku, (_, score) in zip(skus, ranked)]
+
+@metrics.timed("data_manager")
+def filter_transceivers(criteria: Optional[Dict] = None, sort_by: Optional[str] = None) -> pd.DataFrame:
+    """Get transceivers matching filter criteria as a DataFrame.
+
+    ``criteria`` maps facet fields (see FACET_FIELDS) to a value or list of
+    values and numeric spec columns (see NUMERIC_COLUMNS) to a (min, max)
+    range, and may hold a ``search`` term matched as in
+    search_transceivers(). All predicates are combined into one mask and
+    the catalog is sliced once. ``sort_by`` names a numeric spec column to
+    sort on, ascending, with rows lacking a value last. Results are cached
+    until the catalog changes, within QUERY_CACHE_MB.
+    """
+    criteria = normalize_criteria(criteria)
+    if sort_by is not None and sort_by not in NUMERIC_COLUMNS:
+        raise ValueError(f"Cannot sort by: {sort_by}")
+    if _use_sqlite():
+        catalog, generation = None, _file_signature()
+    else:
+        catalog = _get_catalog()
+        if catalog.df.empty or (not criteria and sort_by is None):
+            return catalog.df.copy(deep=not _COPY_ON_WRITE)
+        generation = catalog.generation
+
+    key = _query_key(criteria, sort_by)
+    df = _query_cache.get(key, generation) if _query_cache.budget else None
+    if df is None:
+        if catalog is None:
+            rows = sqlite_store.select(_sqlite(), criteria, sort_by)
+            df = _categorize(pd.DataFrame(rows, columns=CATALOG_COLUMNS + NUMERIC_COLUMNS))
+        else:
+            df = catalog.df.iloc[_matching_rows(catalog, criteria, sort_by)]
+        if _query_cache.budget:
+            _query_cache.put(key, generation, df, int(df.memory_usage(index=True, deep=True).sum()))
+    # Callers may modify the result, so they never get the cached frame itself.
+    return df.copy(deep=not _COPY_ON_WRITE)
+
+def _query_key(criteria: Dict, sort_by: Optional[str]) -> Tuple:
+    """Cache key for normalized criteria: search terms reduce to their sorted distinct tokens."""
+    items = []
+    for field, value in sorted(criteria.items()):
+        if field == 'search':
+            value = tuple(sorted(set(tokenize(value))))
+        items.append((field, value))
+    return tuple(items), sort_by
+
+def get_query_cache_stats() -> Dict:
+    """Entries, bytes used, budget and hit/miss/eviction counts of the filter result cache."""
+    return _query_cache.stats()
+
+def _matching_rows(catalog: _Catalog, criteria: Dict, sort_by: Optional[str]) -> np.ndarray:
+    """Row numbers in ``catalog.df`` matching normalized criteria, in result order."""
+    df = catalog.df
+    if df.empty:
+        return np.arange(0)
+    mask, failed = _mismatches(catalog, criteria)
+    for rows in failed.values():
+        mask &= ~rows
+    if sort_by is None:
+        return np.flatnonzero(mask)
+    # The range index is already sorted; keep its order and append unvalued rows.
+    order, _ = catalog.range_index(sort_by)
+    unvalued = np.ones(len(df), dtype=bool)
+    unvalued[order] = False
+    return np.concatenate([order[mask[order]], np.flatnonzero(mask & unvalued)])
+
+def iter_transceivers(criteria: Optional[Dict] = None, sort_by: Optional[str] = None,
+                      chunk_size: int = 1000) -> Iterator[List[Tuple]]:
+    """Yield matching transceivers in chunks of CATALOG_COLUMNS value tuples.
+
+    Takes the same arguments as filter_transceivers() but never builds the
+    whole result at once.
+    """
+    criteria = normalize_criteria(criteria)
+    if sort_by is not None and sort_by not in NUMERIC_COLUMNS:
+        raise ValueError(f"Cannot sort by: {sort_by}")
+    if _use_sqlite():
+        yield from sqlite_store.iter_select(_sqlite(), criteria, sort_by, chunk_size)
+        return
+    catalog = _get_catalog()
+    rows = _matching_rows(catalog, criteria, sort_by)
+    columns = catalog.df[CATALOG_COLUMNS]
+    for start in range(0, len(rows), chunk_size):
+        chunk = columns.iloc[rows[start:start + chunk_size]].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        yield list(chunk.itertuples(index=False, name=None))
+
+def export_transceivers(criteria: Optional[Dict] = None, file_format: str = "csv",
+                        sort_by: Optional[str] = None) -> Iterator[bytes]:
+    """Stream matching transceivers as CSV, JSON Lines or XLSX bytes.
+
+    Takes the same criteria as filter_transceivers(). Rows are encoded a
+    chunk at a time, e.g. ``f.writelines(export_transceivers(c, "jsonl"))``.
+    """
+    return exporter.export_rows(CATALOG_COLUMNS, iter_transceivers(criteria, sort_by), file_format)
+
+@metrics.timed("data_manager")
+def match_transceivers(requirements, limit: Optional[int] = None,
+                       statuses: Optional[List[str]] = None) -> pd.DataFrame:
+    """Get ranked candidate transceivers for each row of a requirements table.
+
+    ``requirements`` is a DataFrame or list of dicts with any of the
+    matching.REQUIREMENT_FIELDS: form_factor, data_rate, connector and
+    fiber_type (blank for any) and min_reach (meters, or text like "2km").
+    Only transceivers with one of ``statuses`` (default Active) are
+    candidates, so an empty list gives none. See matching.match() for the result columns; use
+    matching.summarize() for one row per requirement.
+    """
+    if not isinstance(requirements, pd.DataFrame):
+        requirements = pd.DataFrame(list(requirements))
+    statuses = tuple(sorted(set(['Active'] if statuses is None else statuses)))
+    index = _get_catalog().match_index(statuses)
+    return matching.match(index, requirements, limit)
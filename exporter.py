@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+import tempfile
+from typing import Iterable, Iterator, List, Sequence
+
+EXPORT_FORMATS = {
+    'csv': ("text/csv", "csv"),
+    'jsonl': ("application/x-ndjson", "jsonl"),
+    'xlsx': ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+# Bytes read at a time when streaming a finished XLSX file.
+XLSX_READ_SIZE = 64 * 1024
+
+
+def _csv_chunks(columns: List[str], chunks: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def _jsonl_chunks(columns: List[str], chunks: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows
+        ).encode('utf-8')
+
+def _xlsx_chunks(columns: List[str], chunks: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    from openpyxl import Workbook
+
+    # Write-only mode streams rows to a temporary sheet file instead of
+    # keeping cell objects in memory; the finished workbook is then read back
+    # in fixed-size pieces.
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Transceivers")
+    sheet.append(columns)
+    for rows in chunks:
+        for row in rows:
+            sheet.append(row)
+    with tempfile.TemporaryFile() as f:
+        workbook.save(f)
+        f.seek(0)
+        while True:
+            data = f.read(XLSX_READ_SIZE)
+            if not data:
+                break
+            yield data
+
+def export_rows(columns: List[str], chunks: Iterable[Sequence[tuple]], file_format: str) -> Iterator[bytes]:
+    """Encode chunks of row tuples as ``file_format`` ("csv", "jsonl" or "xlsx")."""
+    if file_format == 'csv':
+        return _csv_chunks(columns, chunks)
+    if file_format == 'jsonl':
+        return _jsonl_chunks(columns, chunks)
+    if file_format == 'xlsx':
+        return _xlsx_chunks(columns, chunks)
+    raise ValueError(f"Unsupported export format: {file_format}")
@@ -0,0 +1,90 @@
+import csv
+import io
+import os
+from typing import Dict, IO, Iterator, Optional, Tuple, Union
+
+# Spreadsheet header -> record field, for headers that do not simply
+# normalize to the field name ("Form Factor" -> "form_factor").
+HEADER_ALIASES = {
+    'part_number': 'sku',
+    'product_name': 'name',
+    'temp': 'temperature',
+    'operating_temperature': 'temperature',
+    'power_consumption': 'power',
+    'rate': 'data_rate',
+}
+
+
+def normalize_header(header) -> str:
+    """Map a column header to a record field name."""
+    name = str(header or "").strip().lower().replace(" ", "_").replace("-", "_")
+    return HEADER_ALIASES.get(name, name)
+
+def detect_format(source: Union[str, IO], file_format: Optional[str] = None) -> str:
+    """Return "csv" or "xlsx", from ``file_format`` or the file name."""
+    if file_format is None:
+        name = source if isinstance(source, str) else getattr(source, 'name', "")
+        file_format = os.path.splitext(name)[1].lstrip('.')
+    file_format = file_format.lower()
+    if file_format not in ('csv', 'xlsx'):
+        raise ValueError(f"Unsupported import format: {file_format or 'unknown'}")
+    return file_format
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+def _iter_csv(source: Union[str, IO]) -> Iterator[Tuple[int, Dict[str, str]]]:
+    if isinstance(source, str):
+        with open(source, 'r', newline='', encoding='utf-8-sig') as f:
+            yield from _iter_csv_text(f)
+    else:
+        f = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+        try:
+            yield from _iter_csv_text(f)
+        finally:
+            # Leave the caller's file object open.
+            f.detach()
+
+def _iter_csv_text(f: IO) -> Iterator[Tuple[int, Dict[str, str]]]:
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+    fields = [normalize_header(h) for h in header]
+    for row_number, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        yield row_number, {field: _cell(value) for field, value in zip(fields, row)}
+
+def _iter_xlsx(source: Union[str, IO]) -> Iterator[Tuple[int, Dict[str, str]]]:
+    from openpyxl import load_workbook
+
+    # Read-only mode streams rows from the sheet XML instead of building the
+    # whole workbook in memory.
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        fields = [normalize_header(h) for h in header]
+        for row_number, row in enumerate(rows, start=2):
+            if not any(_cell(value) for value in row):
+                continue
+            yield row_number, {field: _cell(value) for field, value in zip(fields, row)}
+    finally:
+        workbook.close()
+
+def iter_rows(source: Union[str, IO], file_format: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Stream (row number, {field: text}) pairs from a CSV or XLSX file.
+
+    ``source`` is a path or a binary file object. Row numbers are 1-based
+    and count the header row, matching what a spreadsheet shows.
+    """
+    if detect_format(source, file_format) == 'csv':
+        return _iter_csv(source)
+    return _iter_xlsx(source)
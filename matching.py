@@ -0,0 +1,212 @@
+import math
+from typing import IO, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+import importer
+from specs import parse_fiber, parse_reach
+
+# Columns of a requirements table. Blank key fields match anything; a blank
+# min_reach accepts every reach, including unknown ones.
+KEY_FIELDS = ['form_factor', 'data_rate', 'connector', 'fiber_type']
+REQUIREMENT_FIELDS = KEY_FIELDS + ['min_reach']
+
+# Port-list headers that mean a requirement field.
+REQUIREMENT_ALIASES = {
+    'cage': 'form_factor',
+    'cage_type': 'form_factor',
+    'speed': 'data_rate',
+    'port_speed': 'data_rate',
+    'fiber': 'fiber_type',
+    'media': 'fiber_type',
+    'distance': 'min_reach',
+    'link_distance': 'min_reach',
+    'min_reach_m': 'min_reach',
+}
+
+FIBER_ALIASES = {
+    'SM': 'SMF', 'SINGLEMODE': 'SMF', 'SINGLE-MODE': 'SMF', 'OS1': 'SMF', 'OS2': 'SMF',
+    'MM': 'MMF', 'MULTIMODE': 'MMF', 'MULTI-MODE': 'MMF',
+}
+
+# Candidate lists kept per index before the cache is cleared.
+CANDIDATE_CACHE_SIZE = 4096
+
+# Catalog columns returned for each candidate.
+RESULT_COLUMNS = ['sku', 'name', 'form_factor', 'data_rate', 'connector', 'reach', 'reach_m', 'power', 'status']
+
+
+def _blank(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value)) or str(value).strip() == ""
+
+def normalize_fiber(value) -> Optional[str]:
+    """Canonical fiber name for a requirement: "SMF", "MMF", "OM1".."OM5", or None."""
+    if _blank(value):
+        return None
+    fiber = str(value).strip().upper()
+    return FIBER_ALIASES.get(fiber, fiber)
+
+def fiber_accepts(required: Optional[str], rated) -> bool:
+    """True if a module rated on ``rated`` fiber can be used on ``required`` fiber.
+
+    Multimode reach only grows with the fiber grade, so a module rated on
+    OM3 is accepted for OM4 plant at its OM3 reach, but not the reverse.
+    """
+    if required is None:
+        return True
+    if not isinstance(rated, str):
+        return False
+    if required == 'MMF':
+        return rated.startswith('OM') or rated == 'MMF'
+    if required.startswith('OM') and rated.startswith('OM'):
+        return rated <= required
+    return required == rated
+
+def parse_min_reach(value) -> Optional[float]:
+    """Minimum reach in meters: plain numbers are meters, text may give units ("2km")."""
+    if _blank(value):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    reach = parse_reach(value)
+    if reach is not None:
+        return reach
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Cannot read minimum reach: {value}")
+
+def read_requirements(source: Union[str, IO], file_format: Optional[str] = None) -> pd.DataFrame:
+    """Read a port list (CSV or XLSX) into a requirements table.
+
+    Headers are normalized as for bulk import and REQUIREMENT_ALIASES are
+    applied; columns other than REQUIREMENT_FIELDS (port names, say) are kept.
+    """
+    rows = [
+        {REQUIREMENT_ALIASES.get(field, field): value for field, value in row.items()}
+        for _, row in importer.iter_rows(source, file_format)
+    ]
+    return pd.DataFrame(rows)
+
+
+class MatchIndex:
+    """Catalog rows grouped by form factor, data rate, connector and fiber type.
+
+    Within a group rows are ordered by reach, then power, so the best
+    candidates for a minimum reach start at a binary-search position:
+    the shortest reach that is long enough, lowest power first. Rows
+    without a known reach sort last.
+    """
+
+    def __init__(self, df: pd.DataFrame, rows: np.ndarray):
+        self.df = df
+        self._reach = df['reach_m'].to_numpy(dtype=float)
+        self._power = df['power_w'].to_numpy(dtype=float)
+        fibers = {value: parse_fiber(value) for value in pd.unique(df['reach'].dropna())}
+        self._fiber = df['reach'].map(fibers).to_numpy(dtype=object)
+        # Canonical spelling of each catalog value, for case-insensitive matching.
+        self.values = {
+            field: {str(v).upper(): v for v in pd.unique(df[field].dropna())}
+            for field in KEY_FIELDS[:-1]
+        }
+        rows = self._ranked(rows)
+        keys = pd.DataFrame({field: df[field].to_numpy(dtype=object)[rows] for field in KEY_FIELDS[:-1]})
+        keys['fiber_type'] = self._fiber[rows]
+        self._groups = {
+            key: rows[positions]
+            for key, positions in keys.groupby(KEY_FIELDS, dropna=False, sort=False).indices.items()
+        }
+        self._candidates = {}
+
+    def _ranked(self, rows: np.ndarray) -> np.ndarray:
+        power = np.nan_to_num(self._power[rows], nan=np.inf)
+        return rows[np.lexsort((rows, power, self._reach[rows]))]
+
+    def candidates(self, key: Tuple) -> Tuple[np.ndarray, np.ndarray, int]:
+        """(ranked rows, their reach, number with a known reach) for a requirement key.
+
+        ``key`` holds KEY_FIELDS values, None meaning any.
+        """
+        cached = self._candidates.get(key)
+        if cached is None:
+            parts = [
+                rows for group, rows in self._groups.items()
+                if all(want is None or want == have for want, have in zip(key[:-1], group[:-1]))
+                and fiber_accepts(key[-1], group[-1])
+            ]
+            rows = self._ranked(np.concatenate(parts)) if parts else np.arange(0)
+            reach = self._reach[rows]
+            cached = (rows, reach, int(np.count_nonzero(~np.isnan(reach))))
+            if len(self._candidates) >= CANDIDATE_CACHE_SIZE:
+                self._candidates.clear()
+            self._candidates[key] = cached
+        return cached
+
+
+def _requirement_keys(index: MatchIndex, requirements: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Normalized KEY_FIELDS per requirement row (None for any) and the minimum reaches."""
+    keys = pd.DataFrame(index=range(len(requirements)))
+    for field in KEY_FIELDS[:-1]:
+        if field not in requirements.columns:
+            keys[field] = None
+            continue
+        canonical = index.values[field]
+        keys[field] = [
+            None if _blank(v) else canonical.get(str(v).strip().upper(), str(v).strip())
+            for v in requirements[field].tolist()
+        ]
+    fibers = requirements['fiber_type'].tolist() if 'fiber_type' in requirements.columns else []
+    keys['fiber_type'] = [normalize_fiber(v) for v in fibers] or None
+    reaches = requirements['min_reach'].tolist() if 'min_reach' in requirements.columns else []
+    min_reach = np.array([parse_min_reach(v) for v in reaches] or [None] * len(requirements), dtype=float)
+    return keys, min_reach
+
+def match(index: MatchIndex, requirements: pd.DataFrame, limit: Optional[int] = None) -> pd.DataFrame:
+    """Ranked candidates for every row of a requirements table.
+
+    Requirement rows are grouped by their key fields, so each distinct
+    combination is looked up once and all of its rows are resolved with one
+    vectorized binary search over the candidates' reach. Returns one row per
+    (requirement, candidate): ``requirement`` is the requirement's position,
+    ``rank`` starts at 1 and ``candidates`` is the total number that qualify,
+    followed by RESULT_COLUMNS. At most ``limit`` candidates are returned per
+    requirement (all of them if None). Requirements with no candidates have
+    no rows.
+    """
+    keys, min_reach = _requirement_keys(index, requirements)
+    parts = []
+    for key, positions in keys.groupby(KEY_FIELDS, dropna=False, sort=False).indices.items():
+        key = tuple(None if _blank(v) else v for v in key)
+        rows, reach, valued = index.candidates(key)
+        wanted = min_reach[positions]
+        has_min = ~np.isnan(wanted)
+        start = np.where(has_min, np.searchsorted(reach[:valued], np.nan_to_num(wanted), side='left'), 0)
+        total = np.where(has_min, valued, len(rows)) - start
+        taken = total if limit is None else np.minimum(total, limit)
+        rank = np.arange(taken.sum()) - np.repeat(np.cumsum(taken) - taken, taken)
+        parts.append((
+            np.repeat(positions, taken),
+            rank + 1,
+            rows[np.repeat(start, taken) + rank],
+            np.repeat(total, taken),
+        ))
+
+    if parts:
+        requirement, rank, rows, total = (np.concatenate(arrays) for arrays in zip(*parts))
+    else:
+        requirement = rank = rows = total = np.arange(0)
+    order = np.lexsort((rank, requirement))
+    df = index.df
+    result = df.iloc[rows[order]].reindex(columns=RESULT_COLUMNS).reset_index(drop=True)
+    result.insert(0, 'requirement', requirement[order])
+    result.insert(1, 'rank', rank[order])
+    result.insert(2, 'candidates', total[order])
+    return result
+
+def summarize(requirements: pd.DataFrame, matches: pd.DataFrame) -> pd.DataFrame:
+    """The requirements table with each row's candidate count and ranked SKUs."""
+    grouped = matches.groupby('requirement')
+    summary = requirements.reset_index(drop=True).copy()
+    summary['candidates'] = grouped['candidates'].first().reindex(summary.index, fill_value=0).astype(int)
+    summary['best_sku'] = grouped['sku'].first().reindex(summary.index).fillna("")
+    summary['skus'] = grouped['sku'].agg(", ".join).reindex(summary.index).fillna("")
+    return summary
@@ -0,0 +1,213 @@
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Recording is on unless OTC_METRICS=0. When it is off every hook returns
+# after a single flag check.
+_enabled = os.environ.get("OTC_METRICS", "1") != "0"
+
+PREFIX = "otc_"
+
+# Histogram bucket upper bounds in seconds.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Individual timings kept for the diagnostics panel.
+RECENT_SIZE = 200
+
+_lock = threading.Lock()
+_histograms: Dict[Tuple[str, Tuple], List] = {}
+_counters: Dict[Tuple[str, Tuple], float] = {}
+_recent = deque(maxlen=RECENT_SIZE)
+_server = None
+_serve_attempted = False
+_log = logging.getLogger(__name__)
+
+
+def enabled() -> bool:
+    """Return True if metrics are being recorded."""
+    return _enabled
+
+def set_enabled(flag: bool):
+    """Turn recording on or off for this process."""
+    global _enabled
+    _enabled = flag
+
+def reset():
+    """Forget everything recorded so far."""
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _recent.clear()
+
+def observe(name: str, seconds: float, **labels):
+    """Record one duration in the ``name`` histogram."""
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            # Per-bucket counts plus the +Inf bucket, then sum and count.
+            histogram = _histograms[key] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+        counts = histogram[0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        histogram[1] += seconds
+        histogram[2] += 1
+        _recent.append((time.time(), name, key[1], seconds))
+
+def increment(name: str, amount: float = 1, **labels):
+    """Add ``amount`` to the ``name`` counter."""
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+@contextmanager
+def _timing(name: str, labels: Dict):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+def timer(name: str, **labels):
+    """Context manager recording how long its block takes."""
+    if not _enabled:
+        return nullcontext()
+    return _timing(name, labels)
+
+def timed(name: str):
+    """Decorator recording each call's duration, labelled with the function name."""
+    def decorate(func):
+        labels = {'function': func.__name__}
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start, **labels)
+        return wrapper
+    return decorate
+
+def _quantile(q: float, counts: List[int], total: int) -> Optional[float]:
+    """Estimate a quantile from bucket counts, interpolating within the bucket."""
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    lower = 0.0
+    for count, upper in zip(counts, BUCKETS):
+        if seen + count >= rank:
+            return lower + (upper - lower) * ((rank - seen) / count if count else 0)
+        seen += count
+        lower = upper
+    return BUCKETS[-1]
+
+def summary() -> List[Dict]:
+    """Per-series count, mean, p50 and p99 (seconds) for every histogram."""
+    with _lock:
+        items = [(key, list(h[0]), h[1], h[2]) for key, h in _histograms.items()]
+    rows = []
+    for (name, labels), counts, total_seconds, count in sorted(items):
+        rows.append({
+            'name': name,
+            'labels': dict(labels),
+            'count': count,
+            'mean': total_seconds / count if count else None,
+            'p50': _quantile(0.5, counts, count),
+            'p99': _quantile(0.99, counts, count),
+        })
+    return rows
+
+def recent(limit: Optional[int] = None) -> List[Dict]:
+    """Latest individual timings, newest first."""
+    with _lock:
+        entries = list(_recent)
+    entries.reverse()
+    return [
+        {'time': t, 'name': name, 'labels': dict(labels), 'seconds': seconds}
+        for t, name, labels, seconds in entries[:limit]
+    ]
+
+def _format_labels(labels: Tuple, extra: Tuple = ()) -> str:
+    parts = []
+    for k, v in labels + extra:
+        v = str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    with _lock:
+        histograms = sorted((key, list(h[0]), h[1], h[2]) for key, h in _histograms.items())
+        counters = sorted(_counters.items())
+    lines = []
+    typed = set()
+    for (name, labels), counts, total_seconds, count in histograms:
+        metric = f"{PREFIX}{name}_seconds"
+        if metric not in typed:
+            typed.add(metric)
+            lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS, counts):
+            cumulative += bucket_count
+            lines.append(f"{metric}_bucket{_format_labels(labels, (('le', bound),))} {cumulative}")
+        lines.append(f"{metric}_bucket{_format_labels(labels, (('le', '+Inf'),))} {count}")
+        lines.append(f"{metric}_sum{_format_labels(labels)} {total_seconds}")
+        lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+    for (name, labels), value in counters:
+        metric = f"{PREFIX}{name}_total"
+        if metric not in typed:
+            typed.add(metric)
+            lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(port: int, host: str = "127.0.0.1") -> bool:
+    """Serve render_prometheus() over HTTP from a daemon thread; returns whether this process does.
+
+    Only the first call in a process tries; later ones return its result.
+    If the port cannot be bound (say another server process already holds
+    it) the error is logged rather than raised.
+    """
+    global _server, _serve_attempted
+    with _lock:
+        if _serve_attempted:
+            return _server is not None
+        _serve_attempted = True
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            _log.warning("Not serving metrics on %s:%d: %s", host, port, e)
+            return False
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return True
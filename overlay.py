@@ -0,0 +1,95 @@
+from collections.abc import MutableMapping
+from typing import Dict, Hashable, Iterator
+
+# Changes an OverlayDict carries before layered() merges them into a new
+# base. Copying a layer costs O(changes) and merging O(len), so this bounds
+# both the per-copy cost and how often the full merge is paid.
+MAX_CHANGES = 1024
+
+
+class OverlayDict(MutableMapping):
+    """A dict that keeps its changes in a layer over a shared, read-only base dict.
+
+    Keys and order behave exactly as in a plain dict that had the same
+    changes applied: an updated key keeps its place, an added or re-added
+    key goes to the end. The base must not be modified afterwards.
+    """
+
+    def __init__(self, base: Dict):
+        self._base = base
+        self._values = {}    # keys set on top of the base, with their values
+        self._hidden = set()  # base keys no longer at their base position
+        self._tail = {}      # keys added on top of the base, in order (values unused)
+
+    @property
+    def changes(self) -> int:
+        """Number of entries in the layer."""
+        return len(self._values) + len(self._hidden)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tail or (key in self._base and key not in self._hidden)
+
+    def __getitem__(self, key: Hashable):
+        try:
+            return self._values[key]
+        except KeyError:
+            if key in self._hidden:
+                raise
+        return self._base[key]
+
+    def __setitem__(self, key: Hashable, value):
+        if key not in self:
+            self._tail[key] = None
+        self._values[key] = value
+
+    def __delitem__(self, key: Hashable):
+        if key not in self:
+            raise KeyError(key)
+        self._values.pop(key, None)
+        if key in self._tail:
+            del self._tail[key]
+        else:
+            self._hidden.add(key)
+
+    def __iter__(self) -> Iterator:
+        hidden = self._hidden
+        if hidden:
+            yield from (key for key in self._base if key not in hidden)
+        else:
+            yield from self._base
+        yield from self._tail
+
+    def __len__(self) -> int:
+        return len(self._base) - len(self._hidden) + len(self._tail)
+
+    def clear(self):
+        self._base = {}
+        self._values = {}
+        self._hidden = set()
+        self._tail = {}
+
+    def merged(self) -> Dict:
+        """The contents as a plain dict, in order."""
+        hidden = self._hidden
+        merged = {key: value for key, value in self._base.items() if key not in hidden}
+        # Updated base keys keep their place; the rest of the layer was added
+        # in tail order.
+        merged.update(self._values)
+        return merged
+
+
+def layered(mapping: Dict) -> OverlayDict:
+    """A copy of a dict or OverlayDict to apply changes to, sharing the unchanged entries.
+
+    ``mapping`` is left as it is. Copying costs O(changes so far) until the
+    layer reaches MAX_CHANGES, when it is merged into a new base.
+    """
+    if not isinstance(mapping, OverlayDict):
+        return OverlayDict(mapping)
+    if mapping.changes >= MAX_CHANGES:
+        return OverlayDict(mapping.merged())
+    copy = OverlayDict(mapping._base)
+    copy._values = dict(mapping._values)
+    copy._hidden = set(mapping._hidden)
+    copy._tail = dict(mapping._tail)
+    return copy
@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable
+import metrics
+
+
+class QueryCache:
+    """Least-recently-used cache of query results within a memory budget.
+
+    Every entry is tagged with the catalog generation it was computed
+    from. Asking with a different generation drops all entries at once,
+    so a write makes every cached result stale immediately. Entries are
+    evicted oldest-use first until the cached results fit in ``budget``
+    bytes; a result larger than the whole budget is not cached.
+    """
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self._entries = OrderedDict()
+        self._generation = None
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _set_generation(self, generation: Hashable):
+        if generation != self._generation:
+            self._entries.clear()
+            self._size = 0
+            self._generation = generation
+
+    def get(self, key: Hashable, generation: Hashable):
+        """The cached result for ``key`` at ``generation``, or None."""
+        with self._lock:
+            self._set_generation(generation)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        metrics.increment("query_cache_requests", result="miss" if entry is None else "hit")
+        return None if entry is None else entry[0]
+
+    def put(self, key: Hashable, generation: Hashable, value, size: int):
+        """Cache ``value`` (about ``size`` bytes) for ``key`` at ``generation``."""
+        evicted = 0
+        with self._lock:
+            self._set_generation(generation)
+            if size > self.budget:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.budget:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self._size -= dropped
+                evicted += 1
+            self.evictions += evicted
+        if evicted:
+            metrics.increment("query_cache_evictions", evicted)
+
+    def clear(self):
+        """Drop every entry; the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict:
+        """Entry count, bytes used, budget and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size': self._size,
+                'budget': self.budget,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
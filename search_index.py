@@ -0,0 +1,440 @@
+import bisect
+import heapq
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+import numpy as np
+import pandas as pd
+
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+# Fields covered by the catalog search box.
+SEARCH_FIELDS = ['sku', 'name', 'description']
+
+# Ranked search: a query token may stand for at most MAX_EXPANSIONS prefix
+# completions and as many fuzzy matches. Only tokens of FUZZY_MIN_LENGTH or
+# more letters are matched fuzzily, against terms whose trigram Jaccard
+# similarity is at least FUZZY_MIN_SIMILARITY. Similarities weight a term's
+# idf: 1 for the exact term, less for completions and fuzzy matches.
+MAX_EXPANSIONS = 8
+FUZZY_MIN_LENGTH = 4
+FUZZY_MIN_SIMILARITY = 0.4
+PREFIX_SIMILARITY = 0.8
+FUZZY_SIMILARITY = 0.7
+# Queries this long or longer also boost the SKUs they are a prefix of.
+SKU_PREFIX_MIN_LENGTH = 3
+# Rows scored together in one step of RankedIndex.search().
+RANK_WINDOW = 65536
+# Relative slack when comparing float32 row scores with score bounds.
+SCORE_TOLERANCE = 1e-6
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens.
+
+    Punctuation is a separator rather than syntax, so "10G+" searches for
+    "10g" and "SFP-10G-LR" for "sfp", "10g" and "lr".
+    """
+    if not isinstance(text, str):
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+class InvertedIndex:
+    """Term -> row postings over a fixed list of documents, with prefix lookup.
+
+    Postings are sorted numpy arrays of row numbers, stored back to back in
+    term order, so the postings of every term starting with a prefix are
+    one contiguous slice. Built once from a snapshot; it is not updated in
+    place (see RankedOverlay for following later changes).
+    """
+
+    def __init__(self, size: int, columns: Iterable[Sequence]):
+        """``columns`` are text fields (each a sequence of ``size`` values) to search."""
+        self.size = n = size
+        # Tokenize each distinct field value once: catalogs repeat names and
+        # descriptions across many SKUs. Terms are numbered as first seen and
+        # kept only as numpy arrays of those numbers, never as per-value sets.
+        term_ids: Dict[str, int] = {}
+        fields = []
+        for column in columns:
+            column_codes, values = pd.factorize(pd.Series(column, dtype=object))
+            lengths = []
+            flat = np.fromiter(_term_numbers(values, term_ids, lengths), dtype=np.int64)
+            fields.append((column_codes, np.array(lengths + [0], dtype=np.int64), flat))
+        terms = sorted(term_ids)
+        renumber = np.empty(len(terms), dtype=np.int64)
+        for i, term in enumerate(terms):
+            renumber[term_ids[term]] = i
+            term_ids[term] = i
+
+        # One (term, row) key per occurrence, deduplicated across fields.
+        keys = []
+        for column_codes, lengths, flat in fields:
+            starts = np.cumsum(lengths) - lengths
+            per_row = lengths[column_codes]
+            rows = np.repeat(np.arange(n, dtype=np.int64), per_row)
+            within = np.arange(per_row.sum()) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+            keys.append(renumber[flat[starts[column_codes][rows] + within]] * n + rows)
+        del fields
+        keys = np.sort(np.concatenate(keys)) if keys else np.zeros(0, dtype=np.int64)
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+        # Rows grouped by term id, ascending within each term.
+        self._rows = (keys % max(n, 1)).astype(np.int32)
+        self._counts = np.bincount(keys // max(n, 1), minlength=len(terms))
+        self._offsets = np.concatenate(([0], np.cumsum(self._counts)))
+        self._terms = terms
+        self._term_ids = term_ids
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _postings(self, term_id: int) -> np.ndarray:
+        return self._rows[self._offsets[term_id]:self._offsets[term_id + 1]]
+
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Term ids [start, end) of the terms starting with ``prefix``."""
+        start = bisect.bisect_left(self._terms, prefix)
+        return start, bisect.bisect_left(self._terms, prefix + "\uffff", start)
+
+    def matches(self, query: str) -> np.ndarray:
+        """Boolean row mask of documents with a term starting with every query token."""
+        mask = np.ones(self.size, dtype=bool)
+        for token in set(tokenize(query)):
+            start, end = self._prefix_range(token)
+            found = np.zeros(self.size, dtype=bool)
+            found[self._rows[self._offsets[start]:self._offsets[end]]] = True
+            mask &= found
+            if start == end:
+                break
+        return mask
+
+
+class RankedIndex(InvertedIndex):
+    """Typo-tolerant, relevance-ranked search over a fixed list of documents.
+
+    Each distinct term has a sorted array of the rows containing it (see
+    InvertedIndex). A query token stands for the term it spells, terms it
+    is a prefix of and, for tokens without digits, terms sharing enough
+    trigrams with it (so "optcal" finds "optical" but "10g" never finds
+    "100g"). A row scores the sum over query tokens of its best term's idf
+    times similarity.
+
+    SKUs equal to the query rank first and SKUs starting with it next.
+    """
+
+    def __init__(self, skus: List[str], columns: Iterable[Sequence], reference: Optional['RankedIndex'] = None):
+        """``columns`` are text fields (each a sequence aligned with ``skus``) to search.
+
+        With a ``reference`` index, terms take their idf from it, so scores
+        compare with the reference's own.
+        """
+        super().__init__(len(skus), columns)
+        terms, counts = self._terms, self._counts
+        self._idf = np.log1p(self.size / np.maximum(counts, 1))
+        if reference is not None:
+            known = [reference._term_ids.get(term) for term in terms]
+            self._idf = np.array([
+                reference._idf[i] if i is not None else np.log1p(reference.size / max(count, 1))
+                for i, count in zip(known, counts.tolist())
+            ])
+
+        self._trigrams: Dict[str, List[int]] = {}
+        for i, term in enumerate(terms):
+            if len(term) >= FUZZY_MIN_LENGTH and term.isalpha():
+                for gram in _trigrams(term):
+                    self._trigrams.setdefault(gram, []).append(i)
+
+        self._skus = skus
+        keys = [sku.upper() for sku in skus]
+        self._sku_order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._sku_keys = [keys[i] for i in self._sku_order]
+
+    def row_of(self, sku: str) -> Optional[int]:
+        """The row of ``sku``, or None."""
+        key = sku.upper()
+        i = bisect.bisect_left(self._sku_keys, key)
+        while i < len(self._sku_keys) and self._sku_keys[i] == key:
+            if self._skus[self._sku_order[i]] == sku:
+                return self._sku_order[i]
+            i += 1
+        return None
+
+    def _expand(self, token: str) -> List[Tuple[int, float]]:
+        """(term id, similarity) for the terms a query token may stand for."""
+        similar = {}
+        exact = self._term_ids.get(token)
+        if exact is not None:
+            similar[exact] = 1.0
+        start, end = self._prefix_range(token)
+        prefixed = [i for i in range(start, end) if i != exact]
+        if len(prefixed) > MAX_EXPANSIONS:
+            prefixed.sort(key=lambda i: self._offsets[i] - self._offsets[i + 1])
+            prefixed = prefixed[:MAX_EXPANSIONS]
+        for i in prefixed:
+            similar[i] = PREFIX_SIMILARITY * len(token) / len(self._terms[i])
+        if len(token) >= FUZZY_MIN_LENGTH and token.isalpha():
+            grams = _trigrams(token)
+            shared = {}
+            for gram in grams:
+                for i in self._trigrams.get(gram, ()):
+                    shared[i] = shared.get(i, 0) + 1
+            fuzzy = []
+            for i, count in shared.items():
+                jaccard = count / (len(grams) + len(_trigrams(self._terms[i])) - count)
+                if jaccard >= FUZZY_MIN_SIMILARITY and i not in similar:
+                    fuzzy.append((jaccard, i))
+            for jaccard, i in sorted(fuzzy, reverse=True)[:MAX_EXPANSIONS]:
+                similar[i] = FUZZY_SIMILARITY * jaccard
+        return list(similar.items())
+
+    def _score(self, entries: List[Tuple[int, np.ndarray, float]], tokens: int,
+               rows: np.ndarray) -> np.ndarray:
+        """Exact scores for specific rows."""
+        best = np.zeros((tokens, len(rows)), dtype=np.float32)
+        for token, postings, weight in entries:
+            found = np.searchsorted(postings, rows)
+            hit = found < len(postings)
+            hit[hit] = postings[found[hit]] == rows[hit]
+            best[token][hit] = np.maximum(best[token][hit], weight)
+        return best.sum(axis=0)
+
+    def _weights(self, query: str) -> Tuple[List[str], List[Tuple[int, np.ndarray, float]], float]:
+        """(query tokens, (token, postings, weight) per term they stand for, highest possible score)."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        entries = []
+        for t, token in enumerate(tokens):
+            for term_id, similarity in self._expand(token):
+                entries.append((t, self._postings(term_id), float(self._idf[term_id] * similarity)))
+        top = [0.0] * len(tokens)
+        for t, _, weight in entries:
+            top[t] = max(top[t], weight)
+        return tokens, entries, sum(top) * (1 - SCORE_TOLERANCE)
+
+    def search(self, query: str, limit: int = 10, allowed: Optional[np.ndarray] = None,
+               boost: Optional[float] = None) -> List[Tuple[int, float]]:
+        """Top ``limit`` (row, score) pairs for a query, best first.
+
+        ``allowed`` is an optional boolean mask of rows that may be
+        returned. Rows are scored a window at a time and kept in a heap of
+        the best ``limit``; once the heap holds only rows with the highest
+        possible score, later windows cannot beat them and are skipped.
+        Equal scores keep row order. A SKU match adds ``boost`` (default:
+        the highest possible text score, at least 1) per tier.
+        """
+        if limit <= 0:
+            return []
+        tokens, entries, best = self._weights(query)
+        if boost is None:
+            boost = max(best, 1.0)
+
+        heap: List[Tuple[float, int]] = []
+        for start in range(0, self.size if entries else 0, RANK_WINDOW):
+            end = min(start + RANK_WINDOW, self.size)
+            bounds = [0.0] * len(tokens)
+            window = []
+            for t, postings, weight in entries:
+                lo, hi = np.searchsorted(postings, np.array((start, end), dtype=np.int32))
+                if hi > lo:
+                    window.append((t, postings[lo:hi] - start, weight))
+                    bounds[t] = max(bounds[t], weight)
+            if not window or (len(heap) == limit and sum(bounds) * (1 - SCORE_TOLERANCE) <= heap[0][0]):
+                continue
+            scores = np.zeros((len(tokens), end - start), dtype=np.float32)
+            for t, rows, weight in window:
+                scores[t][rows] = np.maximum(scores[t][rows], weight)
+            scores = scores.sum(axis=0)
+            if allowed is not None:
+                scores[~allowed[start:end]] = 0
+            floor = heap[0][0] if len(heap) == limit else 0.0
+            candidates = np.flatnonzero(scores > floor)
+            if len(candidates) > limit:
+                values = scores[candidates]
+                kth = np.partition(values, len(values) - limit)[len(values) - limit]
+                above = candidates[values > kth]
+                tied = candidates[values == kth][:limit - len(above)]
+                candidates = np.sort(np.concatenate((above, tied)))
+            for row in candidates:
+                item = (float(scores[row]), -(start + int(row)))
+                if len(heap) < limit:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heappushpop(heap, item)
+            if len(heap) == limit and heap[0][0] >= best:
+                break
+        ranked = {-row: score for score, row in heap}
+
+        # SKU matches go ahead of every text match, an exact SKU first.
+        boosted = self._sku_matches(query.strip().upper(), limit, allowed)
+        if boosted:
+            rows = np.asarray([row for row, _ in boosted], dtype=np.int32)
+            text = self._score(entries, len(tokens), rows) if entries else np.zeros(len(rows))
+            for (row, tier), score in zip(boosted, text):
+                ranked[row] = float(score) + tier * boost
+        return sorted(ranked.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def _sku_matches(self, key: str, limit: int, allowed: Optional[np.ndarray]) -> List[Tuple[int, int]]:
+        """(row, boost tier) for SKUs equal to (tier 2) or starting with (tier 1) an upper-cased query."""
+        if not key:
+            return []
+        matches = []
+        i = bisect.bisect_left(self._sku_keys, key)
+        while i < len(self._sku_keys) and len(matches) < limit:
+            sku = self._sku_keys[i]
+            if sku != key and (len(key) < SKU_PREFIX_MIN_LENGTH or not sku.startswith(key)):
+                break
+            row = self._sku_order[i]
+            if allowed is None or allowed[row]:
+                matches.append((row, 2 if sku == key else 1))
+            i += 1
+        return matches
+
+
+class RankedOverlay:
+    """A RankedIndex plus the documents changed since it was built, searched as one.
+
+    Rows are numbered as in the current document list: the base rows still
+    present, in order, then appended documents, which is the order the
+    catalog keeps records in. Changed documents are scored by a small
+    RankedIndex that takes its idf from the base, so the two sets of scores
+    compare. Like the base, an overlay is not changed once built: updated()
+    returns a new one, at a cost of O(changes so far).
+    """
+
+    def __init__(self, base: RankedIndex):
+        self.base = base
+        self._removed: Set[int] = set()            # deleted base rows
+        self._replaced: Dict[int, Dict] = {}       # base row -> its current document
+        self._moved: Dict[str, int] = {}           # SKU -> base row, for replaced documents
+        self._appended: Dict[str, Dict] = {}       # SKU -> document, in order
+        self._views = None
+
+    @property
+    def changes(self) -> int:
+        """Number of documents deleted, replaced or appended since the base was built."""
+        return len(self._removed) + len(self._replaced) + len(self._appended)
+
+    def _locate(self, sku: str) -> Optional[int]:
+        """Base row of ``sku`` if it is a current base document, -1 if appended, else None."""
+        if sku in self._appended:
+            return -1
+        row = self._moved.get(sku)
+        if row is not None:
+            return row
+        row = self.base.row_of(sku)
+        if row is None or row in self._removed:
+            return None
+        if row in self._replaced and self._replaced[row]['sku'] != sku:
+            return None
+        return row
+
+    def updated(self, changes: Iterable[Tuple[str, Optional[Dict]]]) -> 'RankedOverlay':
+        """A copy with ``(key, document)`` changes applied in order.
+
+        A None document removes ``key``. Any other replaces the document at
+        ``key``, or failing that the one with its own SKU, keeping its place;
+        otherwise it is appended.
+        """
+        overlay = RankedOverlay(self.base)
+        overlay._removed = set(self._removed)
+        overlay._replaced = dict(self._replaced)
+        overlay._moved = dict(self._moved)
+        overlay._appended = dict(self._appended)
+        for key, document in changes:
+            if document is None:
+                overlay._remove(key)
+            else:
+                overlay._store(key, document)
+        return overlay
+
+    def _remove(self, sku: str):
+        row = self._locate(sku)
+        if row == -1:
+            del self._appended[sku]
+        elif row is not None:
+            self._removed.add(row)
+            self._replaced.pop(row, None)
+            self._moved.pop(sku, None)
+
+    def _store(self, key: str, document: Dict):
+        sku = document['sku']
+        row = self._locate(key)
+        if row is None:
+            key, row = sku, self._locate(sku)
+        if row is None:
+            self._appended[sku] = document
+        elif row == -1:
+            self._appended = {
+                (sku if k == key else k): (document if k == key else d) for k, d in self._appended.items()
+            }
+        else:
+            self._moved.pop(key, None)
+            self._replaced[row] = document
+            if sku != self.base._skus[row]:
+                self._moved[sku] = row
+
+    def _build_views(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[RankedIndex]]:
+        """(current row per base row, base rows to search, current row per delta row, delta index)."""
+        views = self._views
+        if views is None:
+            size = self.base.size
+            rows = np.arange(size)
+            removed = np.array(sorted(self._removed), dtype=np.int64)
+            current = rows - np.searchsorted(removed, rows)
+            searchable = np.ones(size, dtype=bool)
+            searchable[removed] = False
+            searchable[list(self._replaced)] = False
+            documents = sorted(self._replaced.items())
+            delta_rows = [int(current[row]) for row, _ in documents]
+            first = size - len(removed)
+            delta_rows.extend(range(first, first + len(self._appended)))
+            documents = [d for _, d in documents] + list(self._appended.values())
+            delta = None
+            if documents:
+                delta = RankedIndex([d['sku'] for d in documents],
+                                    [[d.get(field) for d in documents] for field in SEARCH_FIELDS],
+                                    reference=self.base)
+            views = self._views = (current, searchable, np.array(delta_rows, dtype=np.int64), delta)
+        return views
+
+    def matches(self, query: str) -> np.ndarray:
+        """Boolean mask over the current documents, as InvertedIndex.matches()."""
+        current, searchable, delta_rows, delta = self._build_views()
+        mask = np.zeros(self.base.size - len(self._removed) + len(self._appended), dtype=bool)
+        mask[current[self.base.matches(query) & searchable]] = True
+        if delta is not None:
+            mask[delta_rows[delta.matches(query)]] = True
+        return mask
+
+    def search(self, query: str, limit: int = 10,
+               allowed: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Top ``limit`` (row, score) pairs over the current documents, as RankedIndex.search()."""
+        if limit <= 0:
+            return []
+        current, searchable, delta_rows, delta = self._build_views()
+        base_allowed = searchable
+        if allowed is not None:
+            base_allowed = searchable & allowed[np.minimum(current, len(allowed) - 1)]
+        boost = max(self.base._weights(query)[2], 1.0)
+        ranked = [(int(current[row]), score) for row, score in self.base.search(query, limit, base_allowed, boost)]
+        if delta is not None:
+            delta_allowed = None if allowed is None else allowed[delta_rows]
+            ranked.extend((int(delta_rows[row]), score)
+                          for row, score in delta.search(query, limit, delta_allowed, boost))
+        return sorted(ranked, key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def _term_numbers(values: Iterable, term_ids: Dict[str, int], lengths: List[int]) -> Iterator[int]:
+    """Numbers of the distinct terms of each value, numbering new terms in ``term_ids`` as met.
+
+    The count of terms for each value is appended to ``lengths``.
+    """
+    for value in values:
+        terms = dict.fromkeys(tokenize(value))
+        lengths.append(len(terms))
+        for term in terms:
+            yield term_ids.setdefault(term, len(term_ids))
+
+
+def _trigrams(term: str) -> Set[str]:
+    padded = f" {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
@@ -0,0 +1,84 @@
+import re
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Numeric columns derived from the free-text specification fields.
+NUMERIC_COLUMNS = ['reach_m', 'wavelength_nm', 'power_w', 'temp_min_c', 'temp_max_c']
+
+_NUMBER = r"([-+]?\d+(?:\.\d+)?)"
+REACH_RE = re.compile(_NUMBER + r"\s*(km|m)\b", re.IGNORECASE)
+WAVELENGTH_RE = re.compile(_NUMBER + r"\s*nm\b", re.IGNORECASE)
+POWER_RE = re.compile(_NUMBER + r"\s*W\b")
+FIBER_RE = re.compile(r"\b(SMF|MMF|OS[12]|OM[1-5])\b", re.IGNORECASE)
+TEMPERATURE_RE = re.compile(
+    _NUMBER + r"\s*(?:°\s*C)?\s*(?:to|~|–|\s-\s)\s*" + _NUMBER + r"\s*°?\s*C", re.IGNORECASE
+)
+
+
+def _search(pattern: re.Pattern, text) -> Optional[re.Match]:
+    return pattern.search(text) if isinstance(text, str) else None
+
+def parse_reach(text: str) -> Optional[float]:
+    """Reach in meters, e.g. "10km (SMF)" -> 10000.0."""
+    match = _search(REACH_RE, text)
+    if not match:
+        return None
+    value = float(match.group(1))
+    return value * 1000 if match.group(2).lower() == 'km' else value
+
+def parse_fiber(text: str) -> Optional[str]:
+    """Fiber a reach is rated on, e.g. "300m (OM3)" -> "OM3"; OS1/OS2 read as "SMF"."""
+    match = _search(FIBER_RE, text)
+    if not match:
+        return None
+    fiber = match.group(1).upper()
+    return "SMF" if fiber.startswith("OS") else fiber
+
+def parse_wavelength(text: str) -> Optional[float]:
+    """Wavelength in nanometres, e.g. "1310nm" -> 1310.0.
+
+    For multi-wavelength parts such as "1310nm/1550nm" the first is used.
+    """
+    match = _search(WAVELENGTH_RE, text)
+    return float(match.group(1)) if match else None
+
+def parse_power(text: str) -> Optional[float]:
+    """Power in watts, e.g. "1.5W max" -> 1.5."""
+    match = _search(POWER_RE, text)
+    return float(match.group(1)) if match else None
+
+def parse_temperature(text: str) -> Tuple[Optional[float], Optional[float]]:
+    """Operating range in °C, e.g. "0 to 70°C" -> (0.0, 70.0)."""
+    match = _search(TEMPERATURE_RE, text)
+    if not match:
+        return None, None
+    return float(match.group(1)), float(match.group(2))
+
+def parse_specs(record: Dict) -> Dict[str, Optional[float]]:
+    """Numeric specification columns for one record; unparsable values are None."""
+    temp_min, temp_max = parse_temperature(record.get('temperature'))
+    return {
+        'reach_m': parse_reach(record.get('reach')),
+        'wavelength_nm': parse_wavelength(record.get('wavelength')),
+        'power_w': parse_power(record.get('power')),
+        'temp_min_c': temp_min,
+        'temp_max_c': temp_max,
+    }
+
+def _parse_column(df: pd.DataFrame, field: str, parse) -> pd.Series:
+    """Apply ``parse`` to each distinct value of a column and map the results back."""
+    if field not in df.columns:
+        return pd.Series(np.nan, index=df.index, dtype=float)
+    parsed = {value: parse(value) for value in pd.unique(df[field].dropna())}
+    return df[field].map(parsed)
+
+def add_spec_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add NUMERIC_COLUMNS to a catalog DataFrame as float columns (NaN when unparsable)."""
+    df['reach_m'] = _parse_column(df, 'reach', parse_reach).astype(float)
+    df['wavelength_nm'] = _parse_column(df, 'wavelength', parse_wavelength).astype(float)
+    df['power_w'] = _parse_column(df, 'power', parse_power).astype(float)
+    temperature = _parse_column(df, 'temperature', parse_temperature)
+    df['temp_min_c'] = temperature.map(lambda t: t[0] if isinstance(t, tuple) else None).astype(float)
+    df['temp_max_c'] = temperature.map(lambda t: t[1] if isinstance(t, tuple) else None).astype(float)
+    return df
@@ -0,0 +1,395 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
+from search_index import SEARCH_FIELDS, tokenize
+from specs import NUMERIC_COLUMNS, parse_specs
+
+COLUMNS = [
+    'sku', 'name', 'form_factor', 'data_rate', 'wavelength',
+    'reach', 'connector', 'temperature', 'power', 'description', 'status'
+]
+
+# Record fields plus the numeric spec columns derived from them on write.
+ALL_COLUMNS = COLUMNS + NUMERIC_COLUMNS
+
+# Columns used by the catalog filters; each gets an index.
+INDEXED_COLUMNS = ['form_factor', 'data_rate', 'connector', 'status'] + NUMERIC_COLUMNS
+
+# Change records kept for changes_since(); older ones are pruned as new
+# ones are written.
+CHANGE_LOG_SIZE = 10000
+
+# SKUs bound per query by get_many(); older SQLite builds allow 999 parameters.
+LOOKUP_CHUNK_SIZE = 900
+
+TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transceivers (
+    sku TEXT PRIMARY KEY,
+    name TEXT,
+    form_factor TEXT,
+    data_rate TEXT,
+    wavelength TEXT,
+    reach TEXT,
+    connector TEXT,
+    temperature TEXT,
+    power TEXT,
+    description TEXT,
+    status TEXT,
+    reach_m REAL,
+    wavelength_nm REAL,
+    power_w REAL,
+    temp_min_c REAL,
+    temp_max_c REAL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY,
+    op TEXT NOT NULL,
+    sku TEXT NOT NULL,
+    changes TEXT
+);
+"""
+
+INDEX_SCHEMA = "".join(
+    f"CREATE INDEX IF NOT EXISTS idx_transceivers_{c} ON transceivers({c});\n"
+    for c in INDEXED_COLUMNS
+)
+
+# External-content FTS5 table over the search fields, kept in sync by triggers.
+_fts_columns = ", ".join(SEARCH_FIELDS)
+_fts_new = ", ".join(f"new.{c}" for c in SEARCH_FIELDS)
+_fts_old = ", ".join(f"old.{c}" for c in SEARCH_FIELDS)
+FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS transceivers_fts USING fts5(
+    {_fts_columns}, content='transceivers', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS transceivers_fts_ai AFTER INSERT ON transceivers BEGIN
+    INSERT INTO transceivers_fts(rowid, {_fts_columns}) VALUES (new.rowid, {_fts_new});
+END;
+CREATE TRIGGER IF NOT EXISTS transceivers_fts_ad AFTER DELETE ON transceivers BEGIN
+    INSERT INTO transceivers_fts(transceivers_fts, rowid, {_fts_columns}) VALUES ('delete', old.rowid, {_fts_old});
+END;
+CREATE TRIGGER IF NOT EXISTS transceivers_fts_au AFTER UPDATE ON transceivers BEGIN
+    INSERT INTO transceivers_fts(transceivers_fts, rowid, {_fts_columns}) VALUES ('delete', old.rowid, {_fts_old});
+    INSERT INTO transceivers_fts(rowid, {_fts_columns}) VALUES (new.rowid, {_fts_new});
+END;
+"""
+
+_local = threading.local()
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Return this thread's connection to the database, creating the schema if needed."""
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(TABLE_SCHEMA)
+        _ensure_spec_columns(conn)
+        _ensure_version_column(conn)
+        _ensure_change_log(conn)
+        conn.executescript(INDEX_SCHEMA)
+        _ensure_fts(conn)
+        connections[path] = conn
+    return conn
+
+def _ensure_spec_columns(conn: sqlite3.Connection):
+    """Add and fill the numeric spec columns in databases created before they existed."""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(transceivers)")}
+    missing = [c for c in NUMERIC_COLUMNS if c not in existing]
+    if not missing:
+        return
+    with _transaction(conn):
+        for column in missing:
+            conn.execute(f"ALTER TABLE transceivers ADD COLUMN {column} REAL")
+        rows = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM transceivers").fetchall()
+        assignments = ", ".join(f"{c} = ?" for c in NUMERIC_COLUMNS)
+        conn.executemany(
+            f"UPDATE transceivers SET {assignments} WHERE sku = ?",
+            (tuple(parse_specs(dict(row)).values()) + (row['sku'],) for row in rows)
+        )
+
+def _ensure_version_column(conn: sqlite3.Connection):
+    """Add the per-record version column to databases created before it existed."""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(transceivers)")}
+    if 'version' not in existing:
+        conn.execute("ALTER TABLE transceivers ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+def _ensure_change_log(conn: sqlite3.Connection):
+    """Start the change log at the current change number if it has no starting point yet."""
+    if _get_meta(conn, 'changes_base') is None:
+        _set_meta(conn, 'changes_base', get_seq(conn))
+
+def _ensure_fts(conn: sqlite3.Connection):
+    """Create the full-text index, filling it from existing rows if it is new."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'transceivers_fts'"
+    ).fetchone()
+    conn.executescript(FTS_SCHEMA)
+    if not exists:
+        conn.execute("INSERT INTO transceivers_fts(transceivers_fts) VALUES ('rebuild')")
+
+def close_all():
+    """Close this thread's connections."""
+    for conn in getattr(_local, 'connections', {}).values():
+        conn.close()
+    _local.connections = {}
+
+def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[int]:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row is not None else None
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: int):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+def get_seq(conn: sqlite3.Connection) -> int:
+    """Return the change number of the last committed mutation."""
+    return _get_meta(conn, 'seq') or 0
+
+def is_migrated(conn: sqlite3.Connection) -> bool:
+    """Return True once the database has been populated from the JSON file."""
+    return _get_meta(conn, 'migrated') is not None
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    """BEGIN IMMEDIATE ... COMMIT, rolling back on error."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+@contextmanager
+def snapshot(conn: sqlite3.Connection):
+    """Read transaction, so several SELECTs see the same database state."""
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.execute("COMMIT")
+
+def _row_values(record: Dict) -> tuple:
+    """Values for ALL_COLUMNS, parsing the numeric spec columns from the record."""
+    specs = parse_specs(record)
+    return tuple(record.get(c) for c in COLUMNS) + tuple(specs[c] for c in NUMERIC_COLUMNS)
+
+def replace_all(conn: sqlite3.Connection, records: Iterable[Dict], seq: int, versions: Dict[str, int]):
+    """Replace the whole table with ``records`` in one transaction.
+
+    ``versions`` gives each record's version; records missing from it get 0.
+    """
+    placeholders = ", ".join("?" for _ in ALL_COLUMNS)
+    with _transaction(conn):
+        conn.execute("DELETE FROM transceivers")
+        conn.executemany(
+            f"INSERT OR REPLACE INTO transceivers ({', '.join(ALL_COLUMNS)}, version) VALUES ({placeholders}, ?)",
+            (_row_values(r) + (versions.get(r['sku'], 0),) for r in records)
+        )
+        _set_meta(conn, 'seq', seq)
+        _set_meta(conn, 'migrated', 1)
+        conn.execute("DELETE FROM changes")
+        _set_meta(conn, 'changes_base', seq)
+
+def apply(conn: sqlite3.Connection, entry: Dict):
+    """Apply one mutation (same shape as a journal entry) and record its change number."""
+    apply_many(conn, [entry])
+
+def apply_many(conn: sqlite3.Connection, entries: List[Dict]):
+    """Apply mutations in one transaction and record the last change number."""
+    with _transaction(conn):
+        for entry in entries:
+            _apply_entry(conn, entry)
+        seq = entries[-1]['seq']
+        _set_meta(conn, 'seq', seq)
+        _log_changes(conn, entries)
+        if seq - CHANGE_LOG_SIZE > (_get_meta(conn, 'changes_base') or 0):
+            conn.execute("DELETE FROM changes WHERE seq <= ?", (seq - CHANGE_LOG_SIZE,))
+            _set_meta(conn, 'changes_base', seq - CHANGE_LOG_SIZE)
+
+def _log_changes(conn: sqlite3.Connection, entries: List[Dict]):
+    """Record op, SKU and the changed field values of each entry for changes_since()."""
+    rows = []
+    for entry in entries:
+        changes = None
+        if entry['op'] != 'delete':
+            record = entry['record']
+            changes = json.dumps({f: record.get(f) for f in entry.get('fields', record)})
+        rows.append((entry['seq'], entry['op'], entry['sku'], changes))
+    conn.executemany("INSERT OR REPLACE INTO changes (seq, op, sku, changes) VALUES (?, ?, ?, ?)", rows)
+
+def changes_since(conn: sqlite3.Connection, version: int) -> Optional[Tuple[int, List[Dict]]]:
+    """(latest change number, change records after ``version``), or None if they are not all kept."""
+    with snapshot(conn):
+        seq = get_seq(conn)
+        if not (_get_meta(conn, 'changes_base') or 0) <= version <= seq:
+            return None
+        rows = conn.execute(
+            "SELECT seq, op, sku, changes FROM changes WHERE seq > ? ORDER BY seq", (version,)
+        ).fetchall()
+    changes = []
+    for row in rows:
+        change = {'version': row['seq'], 'op': row['op'], 'sku': row['sku']}
+        if row['changes'] is not None:
+            change['changes'] = json.loads(row['changes'])
+        changes.append(change)
+    return seq, changes
+
+def _apply_entry(conn: sqlite3.Connection, entry: Dict):
+    """Apply one mutation; the record written takes the entry's change number as its version."""
+    op = entry['op']
+    if op == 'add':
+        placeholders = ", ".join("?" for _ in ALL_COLUMNS)
+        conn.execute(
+            f"INSERT INTO transceivers ({', '.join(ALL_COLUMNS)}, version) VALUES ({placeholders}, ?)",
+            _row_values(entry['record']) + (entry['seq'],)
+        )
+    elif op == 'update':
+        assignments = ", ".join(f"{c} = ?" for c in ALL_COLUMNS)
+        conn.execute(
+            f"UPDATE transceivers SET {assignments}, version = ? WHERE sku = ?",
+            _row_values(entry['record']) + (entry['seq'], entry['sku'])
+        )
+    elif op == 'delete':
+        conn.execute("DELETE FROM transceivers WHERE sku = ?", (entry['sku'],))
+
+def load_all(conn: sqlite3.Connection) -> List[Dict]:
+    """Return every record in insertion order."""
+    return [dict(row) for row in conn.execute(
+        f"SELECT {', '.join(COLUMNS)} FROM transceivers ORDER BY rowid"
+    )]
+
+def load_versions(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Return SKU -> version for every record."""
+    return dict(conn.execute("SELECT sku, version FROM transceivers").fetchall())
+
+def get(conn: sqlite3.Connection, sku: str) -> Optional[Dict]:
+    """Look up one record by primary key."""
+    row = conn.execute(
+        f"SELECT {', '.join(COLUMNS)} FROM transceivers WHERE sku = ?", (sku,)
+    ).fetchone()
+    return dict(row) if row is not None else None
+
+def get_many(conn: sqlite3.Connection, skus: List[str]) -> Dict[str, Dict]:
+    """Look up many records by primary key, a chunk of SKUs per query."""
+    records = {}
+    with snapshot(conn):
+        for start in range(0, len(skus), LOOKUP_CHUNK_SIZE):
+            chunk = skus[start:start + LOOKUP_CHUNK_SIZE]
+            for row in conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM transceivers "
+                f"WHERE sku IN ({', '.join('?' * len(chunk))})", chunk
+            ):
+                records[row['sku']] = dict(row)
+    return records
+
+def count(conn: sqlite3.Connection) -> int:
+    """Return the number of records."""
+    return conn.execute("SELECT COUNT(*) FROM transceivers").fetchone()[0]
+
+def distinct(conn: sqlite3.Connection, field: str) -> List[str]:
+    """Return the sorted distinct non-null values of a column."""
+    if field not in COLUMNS:
+        return []
+    return [row[0] for row in conn.execute(
+        f"SELECT DISTINCT {field} FROM transceivers WHERE {field} IS NOT NULL ORDER BY {field}"
+    )]
+
+def _match_expression(query: str) -> str:
+    """FTS5 query requiring a prefix match for every token, with no query syntax."""
+    return " AND ".join(f'"{t}"*' for t in tokenize(query))
+
+def _where(criteria: Dict) -> tuple:
+    """WHERE clause and parameters for filter criteria.
+
+    Fields map to a value or a list of accepted values, numeric spec columns
+    to a (min, max) range; ``search`` is matched through the full-text
+    index, each token as a prefix.
+    """
+    clauses = []
+    params = []
+    for field, value in criteria.items():
+        if field == 'search':
+            continue
+        if field not in ALL_COLUMNS:
+            raise ValueError(f"Unknown field: {field}")
+        if field in NUMERIC_COLUMNS:
+            low, high = value
+            if low is not None:
+                clauses.append(f"{field} >= ?")
+                params.append(low)
+            if high is not None:
+                clauses.append(f"{field} <= ?")
+                params.append(high)
+        elif isinstance(value, str):
+            clauses.append(f"{field} = ?")
+            params.append(value)
+        else:
+            clauses.append(f"{field} IN ({', '.join('?' for _ in value)})")
+            params.extend(value)
+    match = _match_expression(criteria.get('search', ""))
+    if match:
+        clauses.append("rowid IN (SELECT rowid FROM transceivers_fts WHERE transceivers_fts MATCH ?)")
+        params.append(match)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+def _select_sql(columns: List[str], criteria: Dict, sort_by: Optional[str]) -> tuple:
+    where, params = _where(criteria)
+    order = "rowid"
+    if sort_by is not None:
+        if sort_by not in NUMERIC_COLUMNS:
+            raise ValueError(f"Cannot sort by: {sort_by}")
+        order = f"{sort_by} IS NULL, {sort_by}, rowid"
+    return f"SELECT {', '.join(columns)} FROM transceivers{where} ORDER BY {order}", params
+
+def select(conn: sqlite3.Connection, criteria: Dict, sort_by: Optional[str] = None) -> List[Dict]:
+    """Return rows (ALL_COLUMNS) matching the criteria (see _where).
+
+    Rows come in insertion order, or ascending by the numeric ``sort_by``
+    column with rows lacking a value last.
+    """
+    sql, params = _select_sql(ALL_COLUMNS, criteria, sort_by)
+    return [dict(row) for row in conn.execute(sql, params)]
+
+def iter_select(conn: sqlite3.Connection, criteria: Dict, sort_by: Optional[str] = None,
+                chunk_size: int = 1000) -> Iterator[List[tuple]]:
+    """Like select(), but yield chunks of COLUMNS value tuples from a cursor."""
+    sql, params = _select_sql(COLUMNS, criteria, sort_by)
+    cursor = conn.execute(sql, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [tuple(row) for row in rows]
+    finally:
+        cursor.close()
+
+
+def facet_counts(conn: sqlite3.Connection, fields: Iterable[str], criteria: Dict) -> Dict[str, List[tuple]]:
+    """Return (value, count) pairs per field, each honouring the criteria on the other fields."""
+    facets = {}
+    with snapshot(conn):
+        for field in fields:
+            if field not in COLUMNS:
+                facets[field] = []
+                continue
+            others = {f: v for f, v in criteria.items() if f != field}
+            where, params = _where(others)
+            null_check = f"{' AND' if where else ' WHERE'} {field} IS NOT NULL"
+            facets[field] = [tuple(row) for row in conn.execute(
+                f"SELECT {field}, COUNT(*) FROM transceivers{where}{null_check} "
+                f"GROUP BY {field} ORDER BY {field}", params
+            )]
+    return facets
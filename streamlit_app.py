@@ -1,20 +1,61 @@
+import os
+import time
 import streamlit as st
 import pandas as pd
-import base64
+import metrics
 from data_manager import (
     load_transceivers,
     get_transceivers_df,
-    get_unique_values,
+    get_transceiver_count,
+    get_facets,
+    filter_transceivers,
+    rank_transceivers,
+    match_transceivers,
+    import_transceivers,
+    export_transceivers,
+    FACET_FIELDS,
+    CATALOG_COLUMNS,
+    FORM_FACTORS,
+    DATA_RATES,
+    CONNECTORS,
+    STATUSES,
     add_transceiver,
     update_transceiver,
     delete_transceiver,
-    get_transceiver
+    get_transceiver,
+    get_transceivers,
+    get_transceiver_version,
+    get_query_cache_stats,
+    get_watcher_status,
+    start_watcher,
+    ConcurrentModificationError
 )
-from auth import verify_password, change_password, get_default_password_info
+from assets import load_css, logo_src
+from cards import render_cards
+from exporter import EXPORT_FORMATS
+from bom import RESULT_INACTIVE, RESULT_MISSING, RESULT_OK, annotate, parse_bom_text, read_bom
+from matching import REQUIREMENT_FIELDS, read_requirements, summarize
+from auth import login, issue_token, verify_token, change_password, get_default_password_info
 
-# Initialize session state for authentication
-if 'authenticated' not in st.session_state:
-    st.session_state.authenticated = False
+_rerun_started = time.perf_counter()
+
+# Best-ranked search results listed first, or offered when nothing matches exactly
+RANKED_RESULTS = 25
+
+# Expose this process's metrics for Prometheus when OTC_METRICS_PORT is set.
+# Only the first run in a process binds the port; if it is taken (by another
+# server process, say) a warning is logged and the app carries on.
+if os.environ.get("OTC_METRICS_PORT"):
+    metrics.serve(int(os.environ["OTC_METRICS_PORT"]))
+
+# Reload the catalog in a background thread when OTC_WATCH_INTERVAL (seconds) is set
+if os.environ.get("OTC_WATCH_INTERVAL"):
+    start_watcher(float(os.environ["OTC_WATCH_INTERVAL"]))
+
+# Initialize session state for authentication. The session holds a signed,
+# expiring token issued at login instead of re-checking the password.
+if 'auth_token' not in st.session_state:
+    st.session_state.auth_token = None
 
 # Page configuration
 st.set_page_config(
@@ -25,207 +66,9 @@ st.set_page_config(
 )
 
 # Custom CSS for Ruckus Networks branding
-st.markdown("""
-<style>
-    /* Import Open Sans font (Ruckus Networks official font) */
-    @import url('https://fonts.googleapis.com/css2?family=Open+Sans:wght@300;400;600;700;800&display=swap');
-
-    /* Ruckus Networks Official Colors */
-    :root {
-        --ruckus-orange: #F47920;
-        --ruckus-dark: #101820;
-        --ruckus-yellow: #FFDF7E;
-        --ruckus-light-gray: #F5F5F5;
-        --ruckus-gray: #6B6B6B;
-    }
-
-    /* Global font family */
-    html, body, [class*="css"] {
-        font-family: 'Open Sans', sans-serif;
-    }
-
-    /* Main container styling */
-    .main {
-        background-color: #FFFFFF;
-    }
-
-    /* Header styling */
-    .ruckus-header {
-        background: linear-gradient(135deg, var(--ruckus-dark) 0%, #1a2832 100%);
-        padding: 2rem 2rem 1.5rem 2rem;
-        margin: -1rem -1rem 2rem -1rem;
-        border-bottom: 4px solid var(--ruckus-orange);
-    }
-
-    .ruckus-logo-text {
-        font-size: 2.5rem;
-        font-weight: 800;
-        color: var(--ruckus-orange);
-        margin: 0;
-        letter-spacing: -0.5px;
-        text-transform: uppercase;
-    }
-
-    .ruckus-subtitle {
-        font-size: 1.2rem;
-        font-weight: 300;
-        color: #FFFFFF;
-        margin-top: 0.5rem;
-        letter-spacing: 0.5px;
-    }
-
-    /* Navigation buttons */
-    .stButton > button {
-        background-color: var(--ruckus-orange);
-        color: white;
-        border: none;
-        border-radius: 4px;
-        padding: 0.75rem 2rem;
-        font-weight: 600;
-        font-size: 1rem;
-        transition: all 0.3s ease;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-
-    .stButton > button:hover {
-        background-color: #E56A10;
-        box-shadow: 0 4px 12px rgba(244, 121, 32, 0.3);
-        transform: translateY(-2px);
-    }
-
-    /* Filter box styling */
-    .filter-box {
-        background: linear-gradient(135deg, var(--ruckus-light-gray) 0%, #FFFFFF 100%);
-        padding: 1.5rem;
-        border-radius: 8px;
-        border-left: 4px solid var(--ruckus-orange);
-        margin-bottom: 1.5rem;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.05);
-    }
-
-    /* Section headers */
-    h1, h2, h3 {
-        color: var(--ruckus-dark);
-        font-weight: 700;
-    }
-
-    /* Info boxes */
-    .stInfo {
-        background-color: rgba(255, 223, 126, 0.2);
-        border-left: 4px solid var(--ruckus-yellow);
-    }
-
-    .stWarning {
-        background-color: rgba(244, 121, 32, 0.1);
-        border-left: 4px solid var(--ruckus-orange);
-    }
-
-    .stSuccess {
-        background-color: rgba(76, 175, 80, 0.1);
-        border-left: 4px solid #4CAF50;
-    }
-
-    .stError {
-        background-color: rgba(244, 67, 54, 0.1);
-        border-left: 4px solid #F44336;
-    }
-
-    /* DataFrames and tables */
-    .dataframe {
-        border: 1px solid var(--ruckus-gray);
-        border-radius: 4px;
-    }
-
-    .dataframe thead tr th {
-        background-color: var(--ruckus-dark);
-        color: white;
-        font-weight: 600;
-        text-transform: uppercase;
-        font-size: 0.85rem;
-        letter-spacing: 0.5px;
-    }
-
-    .dataframe tbody tr:hover {
-        background-color: rgba(244, 121, 32, 0.05);
-    }
-
-    /* Product cards */
-    .product-card {
-        background-color: white;
-        padding: 1.5rem;
-        border-radius: 8px;
-        border: 1px solid #E0E0E0;
-        margin-bottom: 1rem;
-        transition: all 0.3s ease;
-    }
-
-    .product-card:hover {
-        box-shadow: 0 4px 12px rgba(244, 121, 32, 0.15);
-        border-color: var(--ruckus-orange);
-    }
-
-    /* Form elements */
-    .stTextInput > div > div > input,
-    .stSelectbox > div > div > select,
-    .stTextArea > div > div > textarea {
-        border: 2px solid #E0E0E0;
-        border-radius: 4px;
-        font-family: 'Open Sans', sans-serif;
-    }
-
-    .stTextInput > div > div > input:focus,
-    .stSelectbox > div > div > select:focus,
-    .stTextArea > div > div > textarea:focus {
-        border-color: var(--ruckus-orange);
-        box-shadow: 0 0 0 1px var(--ruckus-orange);
-    }
-
-    /* Divider */
-    hr {
-        border-color: var(--ruckus-orange);
-        opacity: 0.3;
-    }
-
-    /* Footer */
-    .ruckus-footer {
-        background-color: var(--ruckus-dark);
-        color: white;
-        padding: 2rem;
-        margin: 3rem -1rem -1rem -1rem;
-        text-align: center;
-        font-size: 0.9rem;
-        border-top: 3px solid var(--ruckus-orange);
-    }
-
-    .ruckus-footer a {
-        color: var(--ruckus-orange);
-        text-decoration: none;
-        font-weight: 600;
-    }
-
-    /* Radio buttons */
-    .stRadio > label {
-        font-weight: 600;
-        color: var(--ruckus-dark);
-    }
-
-    /* Login form styling */
-    .login-container {
-        background: linear-gradient(135deg, var(--ruckus-dark) 0%, #1a2832 100%);
-        padding: 3rem;
-        border-radius: 12px;
-        box-shadow: 0 8px 24px rgba(0,0,0,0.2);
-        border: 2px solid var(--ruckus-orange);
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # Header section with Ruckus branding
-# Read and encode logo
-with open("Ruckus_logo_white-orange.png", "rb") as f:
-    logo_data = base64.b64encode(f.read()).decode()
-
 st.markdown(f"""
 <div class="ruckus-header">
     <div style="display: flex; justify-content: space-between; align-items: center;">
@@ -234,7 +77,7 @@ st.markdown(f"""
             <div class="ruckus-subtitle">Optical Transceivers Catalog</div>
         </div>
         <div>
-            <img src="data:image/png;base64,{logo_data}" style="height: 60px; margin-right: 1rem;" alt="Ruckus Networks Logo">
+            <img src="{logo_src()}" style="height: 60px; margin-right: 1rem;" alt="Ruckus Networks Logo">
         </div>
     </div>
 </div>
@@ -242,11 +85,17 @@ st.markdown(f"""
 
 # Navigation
 st.markdown('<div style="margin-bottom: 2rem;">', unsafe_allow_html=True)
-col1, col2, col3, col4, col5 = st.columns([1, 2, 0.5, 2, 4])
+col1, col2, col3, col4, col5, col6, col7, col8, col9 = st.columns([0.5, 2, 0.3, 2, 0.3, 2, 0.3, 2, 0.5])
 with col2:
     if st.button("🔷 PRODUCT CATALOG", use_container_width=True, key="nav_catalog"):
         st.session_state.current_page = "catalog"
 with col4:
+    if st.button("🔗 PORT MATCHING", use_container_width=True, key="nav_match"):
+        st.session_state.current_page = "match"
+with col6:
+    if st.button("📋 BOM CHECK", use_container_width=True, key="nav_bom"):
+        st.session_state.current_page = "bom"
+with col8:
     if st.button("🔧 ADMIN PANEL", use_container_width=True, key="nav_admin"):
         st.session_state.current_page = "admin"
 st.markdown('</div>', unsafe_allow_html=True)
@@ -257,6 +106,28 @@ if 'current_page' not in st.session_state:
 
 st.markdown('<hr style="margin: 1.5rem 0; border-color: #F47920; opacity: 0.3;">', unsafe_allow_html=True)
 
+def loaded_version(action, sku):
+    """Version of ``sku`` when the admin first opened it for ``action``.
+
+    Sent back with the write so an edit based on stale data is refused.
+    """
+    key = f"{action}_version"
+    loaded = st.session_state.get(key)
+    if loaded is None or loaded[0] != sku:
+        loaded = st.session_state[key] = (sku, get_transceiver_version(sku))
+    return loaded[1]
+
+def spec_ranges():
+    """Filter criteria for the numeric specification range inputs."""
+    state = st.session_state
+    return {
+        'reach_m': (state.get("range_min_reach"), None),
+        'power_w': (None, state.get("range_max_power")),
+        'wavelength_nm': (state.get("range_min_wavelength"), state.get("range_max_wavelength")),
+        'temp_min_c': (None, state.get("range_low_temp")),
+        'temp_max_c': (state.get("range_high_temp"), None),
+    }
+
 # Display the appropriate page
 if st.session_state.current_page == "catalog":
     st.markdown("""
@@ -266,143 +137,303 @@ if st.session_state.current_page == "catalog":
     """, unsafe_allow_html=True)
 
     # Filters section
-    with st.container():
+    with st.container(), metrics.timer("page_section", section="filters"):
         st.markdown('<div class="filter-box">', unsafe_allow_html=True)
+        # Widget values are already in session state when the script reruns,
+        # so each dropdown's counts can honour the other current selections
+        active_filters = {field: st.session_state.get(f"filter_{field}") for field in FACET_FIELDS}
+        active_filters['search'] = st.session_state.get("search_term", "")
+        active_filters.update(spec_ranges())
+        facets = get_facets(FACET_FIELDS, active_filters)
+
+        def facet_selectbox(label, field):
+            counts = dict(facets[field])
+            options = ["All"] + [value for value, _ in facets[field]]
+            selected = st.session_state.get(f"filter_{field}", "All")
+            if selected not in counts and selected != "All":
+                options.append(selected)
+            return st.selectbox(
+                label,
+                options,
+                key=f"filter_{field}",
+                format_func=lambda v: v if v == "All" else f"{v} ({counts.get(v, 0)})"
+            )
+
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            form_factors = ["All"] + get_unique_values("form_factor")
-            selected_form_factor = st.selectbox("Form Factor", form_factors)
+            selected_form_factor = facet_selectbox("Form Factor", "form_factor")
 
         with col2:
-            data_rates = ["All"] + get_unique_values("data_rate")
-            selected_data_rate = st.selectbox("Data Rate", data_rates)
+            selected_data_rate = facet_selectbox("Data Rate", "data_rate")
 
         with col3:
-            connectors = ["All"] + get_unique_values("connector")
-            selected_connector = st.selectbox("Connector", connectors)
+            selected_connector = facet_selectbox("Connector", "connector")
 
         with col4:
-            statuses = ["All"] + get_unique_values("status")
-            selected_status = st.selectbox("Status", statuses)
+            selected_status = facet_selectbox("Status", "status")
 
         # Search box
-        search_term = st.text_input("🔍 Search by SKU, Name, or Description", "")
+        search_term = st.text_input("🔍 Search by SKU, Name, or Description", "", key="search_term")
+
+        # Numeric specification ranges
+        with st.expander("📏 Specification Ranges"):
+            col1, col2, col3, col4, col5, col6 = st.columns(6)
+            with col1:
+                st.number_input("Min Reach (m)", min_value=0.0, value=None, step=100.0, key="range_min_reach")
+            with col2:
+                st.number_input("Max Power (W)", min_value=0.0, value=None, step=0.5, key="range_max_power")
+            with col3:
+                st.number_input("Wavelength From (nm)", min_value=0.0, value=None, step=10.0, key="range_min_wavelength")
+            with col4:
+                st.number_input("Wavelength To (nm)", min_value=0.0, value=None, step=10.0, key="range_max_wavelength")
+            with col5:
+                st.number_input("Operates Down To (°C)", value=None, step=5.0, key="range_low_temp")
+            with col6:
+                st.number_input("Operates Up To (°C)", value=None, step=5.0, key="range_high_temp")
+
+            sort_options = {
+                "Catalog Order": None,
+                "Reach": "reach_m",
+                "Wavelength": "wavelength_nm",
+                "Power": "power_w",
+            }
+            sort_label = st.selectbox("Sort By", list(sort_options), key="sort_by")
 
         st.markdown('</div>', unsafe_allow_html=True)
 
     # Load and filter data
-    df = get_transceivers_df()
-
-    if not df.empty:
-        # Apply filters
-        if selected_form_factor != "All":
-            df = df[df['form_factor'] == selected_form_factor]
-
-        if selected_data_rate != "All":
-            df = df[df['data_rate'] == selected_data_rate]
+    if get_transceiver_count() > 0:
+        criteria = {
+            'form_factor': selected_form_factor,
+            'data_rate': selected_data_rate,
+            'connector': selected_connector,
+            'status': selected_status,
+            'search': search_term,
+            **spec_ranges(),
+        }
+        sort_by = sort_options[sort_label]
+        df = filter_transceivers(criteria, sort_by=sort_by)
+
+        # Relevance ranking for searches: best matches first, closest matches if none
+        closest = False
+        if search_term.strip() and (sort_by is None or df.empty):
+            with metrics.timer("page_section", section="ranked_search"):
+                ranked = rank_transceivers(search_term, dict(criteria, search=None), limit=RANKED_RESULTS)
+            rank_of = {sku: rank for rank, (sku, _) in enumerate(ranked)}
+            if not df.empty:
+                df = df.sort_values('sku', key=lambda skus: skus.map(rank_of), kind='stable', na_position='last')
+            elif ranked:
+                closest = True
+                found = get_transceivers(list(rank_of))['found']
+                df = pd.DataFrame([found[sku] for sku in rank_of if sku in found])
 
-        if selected_connector != "All":
-            df = df[df['connector'] == selected_connector]
+        # Display results count
+        if closest:
+            st.info(f'No exact matches for "{search_term}". Showing the {len(df)} closest transceivers')
+        else:
+            st.info(f"Found {len(df)} transceivers")
 
-        if selected_status != "All":
-            df = df[df['status'] == selected_status]
+        # Server-side export of the current results; generated only when clicked
+        col1, col2, col3 = st.columns([1, 1, 4])
+        with col1:
+            export_format = st.selectbox("Export Format", list(EXPORT_FORMATS), key="export_format",
+                                         format_func=str.upper)
+        with col2:
+            mime, extension = EXPORT_FORMATS[export_format]
 
-        # Apply search filter
-        if search_term:
-            df = df[
-                df['sku'].str.contains(search_term, case=False, na=False) |
-                df['name'].str.contains(search_term, case=False, na=False) |
-                df['description'].str.contains(search_term, case=False, na=False)
-            ]
+            def build_export(criteria=criteria, sort_by=sort_by, export_format=export_format):
+                return b"".join(export_transceivers(criteria, export_format, sort_by))
 
-        # Display results count
-        st.info(f"Found {len(df)} transceivers")
+            st.download_button(
+                "⬇️ Export Results",
+                data=build_export,
+                file_name=f"ruckus_transceivers.{extension}",
+                mime=mime,
+                disabled=df.empty
+            )
 
         # Display view options
         view_mode = st.radio("View Mode", ["Table View", "Card View"], horizontal=True)
 
         if view_mode == "Table View":
             # Display as table
+            with metrics.timer("page_section", section="table"):
+                st.dataframe(
+                    df,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_order=CATALOG_COLUMNS,
+                    column_config={
+                        "sku": st.column_config.TextColumn("SKU", width="medium"),
+                        "name": st.column_config.TextColumn("Name", width="large"),
+                        "form_factor": st.column_config.TextColumn("Form Factor", width="small"),
+                        "data_rate": st.column_config.TextColumn("Data Rate", width="small"),
+                        "wavelength": st.column_config.TextColumn("Wavelength", width="medium"),
+                        "reach": st.column_config.TextColumn("Reach", width="medium"),
+                        "connector": st.column_config.TextColumn("Connector", width="small"),
+                        "temperature": st.column_config.TextColumn("Temperature", width="medium"),
+                        "power": st.column_config.TextColumn("Power", width="small"),
+                        "description": st.column_config.TextColumn("Description", width="large"),
+                        "status": st.column_config.TextColumn("Status", width="small")
+                    }
+                )
+        else:
+            # Display as cards, one page at a time
+            col1, col2, col3 = st.columns([1, 1, 4])
+            with col1:
+                page_size = st.selectbox("Cards per Page", [10, 25, 50, 100], key="card_page_size")
+            page_count = max(1, -(-len(df) // page_size))
+            if st.session_state.get("card_page", 1) > page_count:
+                st.session_state.card_page = page_count
+            with col2:
+                page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key="card_page")
+
+            start = (page - 1) * page_size
+            end = min(start + page_size, len(df))
+            if len(df):
+                st.caption(f"Page {page} of {page_count} · showing {start + 1}–{end} of {len(df)}")
+            with metrics.timer("page_section", section="cards"):
+                st.markdown(render_cards(df.iloc[start:end]), unsafe_allow_html=True)
+    else:
+        st.warning("No transceivers found in the catalog.")
+
+# Port Matching Page
+elif st.session_state.current_page == "match":
+    st.markdown("""
+    <div style="background: linear-gradient(90deg, #F47920 0%, #101820 100%); padding: 1rem 1.5rem; border-radius: 8px; margin-bottom: 1.5rem;">
+        <h2 style="color: white; margin: 0; font-weight: 700; font-size: 1.8rem;">🔗 PORT MATCHING</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.info(
+        "Upload a CSV or Excel (.xlsx) list of ports with any of these columns: "
+        + ", ".join(REQUIREMENT_FIELDS)
+        + ". min_reach is the link distance in meters (or with units, e.g. 2km); blank columns match anything. "
+        "Other columns, such as a port name, are kept in the results."
+    )
+
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        port_file = st.file_uploader("Port List", type=["csv", "xlsx"], key="match_file")
+    with col2:
+        match_limit = st.number_input("Candidates per Port", min_value=1, max_value=50, value=5, key="match_limit")
+    with col3:
+        match_statuses = st.multiselect("Status", STATUSES, default=["Active"], key="match_statuses")
+
+    if port_file is not None and not match_statuses:
+        st.warning("Select at least one status to find candidates.")
+    elif port_file is not None:
+        try:
+            with metrics.timer("page_section", section="match"):
+                port_file.seek(0)
+                requirements = read_requirements(port_file)
+                matches = match_transceivers(requirements, limit=int(match_limit), statuses=match_statuses)
+                summary = summarize(requirements, matches)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+        else:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Ports", len(summary))
+            col2.metric("Matched", int((summary['candidates'] > 0).sum()))
+            col3.metric("No Candidates", int((summary['candidates'] == 0).sum()))
+
+            st.markdown("#### Ports")
             st.dataframe(
-                df,
+                summary,
                 use_container_width=True,
                 hide_index=True,
                 column_config={
-                    "sku": st.column_config.TextColumn("SKU", width="medium"),
-                    "name": st.column_config.TextColumn("Name", width="large"),
-                    "form_factor": st.column_config.TextColumn("Form Factor", width="small"),
-                    "data_rate": st.column_config.TextColumn("Data Rate", width="small"),
-                    "wavelength": st.column_config.TextColumn("Wavelength", width="medium"),
-                    "reach": st.column_config.TextColumn("Reach", width="medium"),
-                    "connector": st.column_config.TextColumn("Connector", width="small"),
-                    "temperature": st.column_config.TextColumn("Temperature", width="medium"),
-                    "power": st.column_config.TextColumn("Power", width="small"),
-                    "description": st.column_config.TextColumn("Description", width="large"),
-                    "status": st.column_config.TextColumn("Status", width="small")
+                    "candidates": st.column_config.NumberColumn("Candidates", width="small"),
+                    "best_sku": st.column_config.TextColumn("Best Match", width="medium"),
+                    "skus": st.column_config.TextColumn("Ranked SKUs", width="large"),
                 }
             )
-        else:
-            # Display as cards
-            for idx, row in df.iterrows():
-                st.markdown(f"""
-                <div style="background: white; padding: 1.5rem; border-radius: 8px; border: 1px solid #E0E0E0;
-                            margin-bottom: 1rem; box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-                            transition: all 0.3s ease; border-left: 4px solid #F47920;">
-                    <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 1rem;">
-                        <div>
-                            <div style="font-weight: 700; color: #F47920; font-size: 0.85rem; margin-bottom: 0.25rem;">SKU</div>
-                            <div style="font-weight: 600; color: #101820; font-size: 1.1rem;">{row['sku']}</div>
-                            <div style="font-weight: 600; color: #6B6B6B; font-size: 0.95rem; margin-top: 0.5rem;">{row['name']}</div>
-                        </div>
-                        <div>
-                            <div style="margin-bottom: 0.5rem;">
-                                <span style="font-weight: 700; color: #F47920;">Form Factor:</span>
-                                <span style="color: #101820;">{row['form_factor']}</span>
-                                <span style="margin: 0 0.5rem;">|</span>
-                                <span style="font-weight: 700; color: #F47920;">Data Rate:</span>
-                                <span style="color: #101820;">{row['data_rate']}</span>
-                            </div>
-                            <div style="margin-bottom: 0.5rem;">
-                                <span style="font-weight: 700; color: #F47920;">Wavelength:</span>
-                                <span style="color: #101820;">{row['wavelength']}</span>
-                                <span style="margin: 0 0.5rem;">|</span>
-                                <span style="font-weight: 700; color: #F47920;">Reach:</span>
-                                <span style="color: #101820;">{row['reach']}</span>
-                            </div>
-                            <div>
-                                <span style="font-weight: 700; color: #F47920;">Connector:</span>
-                                <span style="color: #101820;">{row['connector']}</span>
-                                <span style="margin: 0 0.5rem;">|</span>
-                                <span style="font-weight: 700; color: #F47920;">Temp:</span>
-                                <span style="color: #101820;">{row['temperature']}</span>
-                            </div>
-                        </div>
-                        <div style="text-align: right;">
-                            <div style="margin-bottom: 0.5rem;">
-                                <span style="font-weight: 700; color: #F47920;">Power:</span>
-                                <span style="color: #101820;">{row['power']}</span>
-                            </div>
-                            <div style="display: inline-block; background: {'#4CAF50' if row['status'] == 'Active' else '#F44336'};
-                                        color: white; padding: 0.25rem 0.75rem; border-radius: 20px;
-                                        font-weight: 600; font-size: 0.85rem;">
-                                {row['status']}
-                            </div>
-                        </div>
-                    </div>
-                    <div style="margin-top: 1rem; padding-top: 1rem; border-top: 1px solid #E0E0E0;
-                                font-style: italic; color: #6B6B6B; font-size: 0.9rem;">
-                        {row['description']}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-    else:
-        st.warning("No transceivers found in the catalog.")
+
+            st.markdown("#### Candidates")
+            candidates = summary.drop(columns=['candidates', 'best_sku', 'skus']).join(
+                matches.set_index('requirement'), how='inner', rsuffix='_match'
+            )
+            st.dataframe(candidates, use_container_width=True, hide_index=True)
+
+            st.download_button(
+                "⬇️ Download Matches",
+                data=candidates.to_csv(index=False),
+                file_name="ruckus_port_matches.csv",
+                mime="text/csv",
+                disabled=candidates.empty
+            )
+
+# BOM Check Page
+elif st.session_state.current_page == "bom":
+    st.markdown("""
+    <div style="background: linear-gradient(90deg, #F47920 0%, #101820 100%); padding: 1rem 1.5rem; border-radius: 8px; margin-bottom: 1.5rem;">
+        <h2 style="color: white; margin: 0; font-weight: 700; font-size: 1.8rem;">📋 BOM CHECK</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.info(
+        "Paste one SKU per line, optionally followed by a quantity (\"RN-SFP-10G-SR, 4\"), "
+        "or upload a CSV or Excel (.xlsx) file with a SKU column and an optional Quantity column. "
+        "Every line is checked against the catalog."
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        bom_text = st.text_area("Paste BOM", height=200, key="bom_text")
+    with col2:
+        bom_file = st.file_uploader("Or Upload BOM", type=["csv", "xlsx"], key="bom_file")
+
+    bom_lines = None
+    try:
+        if bom_file is not None:
+            bom_file.seek(0)
+            bom_lines = read_bom(bom_file)
+        elif bom_text.strip():
+            bom_lines = parse_bom_text(bom_text)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+
+    if bom_lines is not None:
+        with metrics.timer("page_section", section="bom"):
+            checked = annotate(bom_lines, get_transceivers(bom_lines['sku'].tolist()))
+        results = checked['result']
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Lines", len(checked))
+        col2.metric("OK", int((results == RESULT_OK).sum()))
+        col3.metric("Not Active", int((results == RESULT_INACTIVE).sum()))
+        col4.metric("Missing", int((results == RESULT_MISSING).sum()))
+
+        problems_only = st.checkbox("Show only lines with problems", key="bom_problems_only")
+        shown = checked[results != RESULT_OK] if problems_only else checked
+        st.dataframe(
+            shown,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "line": st.column_config.NumberColumn("Line", width="small"),
+                "sku": st.column_config.TextColumn("SKU", width="medium"),
+                "quantity": st.column_config.NumberColumn("Qty", width="small"),
+                "name": st.column_config.TextColumn("Name", width="large"),
+                "form_factor": st.column_config.TextColumn("Form Factor", width="small"),
+                "data_rate": st.column_config.TextColumn("Data Rate", width="small"),
+                "status": st.column_config.TextColumn("Status", width="small"),
+                "result": st.column_config.TextColumn("Result", width="small"),
+            }
+        )
+
+        st.download_button(
+            "⬇️ Download Checked BOM",
+            data=checked.to_csv(index=False),
+            file_name="ruckus_bom_check.csv",
+            mime="text/csv"
+        )
 
 # Admin Panel Page
 elif st.session_state.current_page == "admin":
     # Check if user is authenticated
-    if not st.session_state.authenticated:
+    if not verify_token(st.session_state.auth_token):
         # Login Screen
         st.markdown("""
         <div style="background: linear-gradient(90deg, #101820 0%, #F47920 100%); padding: 1rem 1.5rem; border-radius: 8px; margin-bottom: 1.5rem;">
@@ -412,15 +443,19 @@ elif st.session_state.current_page == "admin":
 
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            st.info("Please enter the admin password to access the admin panel.")
+            if st.session_state.auth_token:
+                st.info("Your session has expired. Please log in again.")
+            else:
+                st.info("Please enter the admin password to access the admin panel.")
 
             with st.form("login_form"):
                 password = st.text_input("Password", type="password", placeholder="Enter admin password")
                 submit_login = st.form_submit_button("Login", use_container_width=True)
 
                 if submit_login:
-                    if password and verify_password(password):
-                        st.session_state.authenticated = True
+                    token = login(password) if password else None
+                    if token:
+                        st.session_state.auth_token = token
                         st.success("✅ Login successful!")
                         st.rerun()
                     else:
@@ -441,7 +476,7 @@ elif st.session_state.current_page == "admin":
         col1, col2, col3 = st.columns([2, 2, 6])
         with col1:
             if st.button("🔓 Logout", use_container_width=True):
-                st.session_state.authenticated = False
+                st.session_state.auth_token = None
                 st.success("Logged out successfully!")
                 st.rerun()
         with col2:
@@ -467,6 +502,7 @@ elif st.session_state.current_page == "admin":
                         elif len(new_password) < 6:
                             st.error("❌ Password must be at least 6 characters long!")
                         elif change_password(old_password, new_password):
+                            st.session_state.auth_token = issue_token()
                             st.success("✅ Password changed successfully!")
                             if 'show_password_change' in st.session_state:
                                 del st.session_state.show_password_change
@@ -484,7 +520,7 @@ elif st.session_state.current_page == "admin":
         # Admin Actions (only visible when authenticated)
         admin_action = st.radio(
             "Select Action",
-            ["Add New Transceiver", "Edit Transceiver", "Delete Transceiver"],
+            ["Add New Transceiver", "Edit Transceiver", "Delete Transceiver", "Bulk Import", "Diagnostics"],
             horizontal=True
         )
 
@@ -497,16 +533,16 @@ elif st.session_state.current_page == "admin":
                 with col1:
                     sku = st.text_input("SKU *", placeholder="e.g., RN-SFP-10G-SR")
                     name = st.text_input("Name *", placeholder="e.g., Ruckus 10GBASE-SR SFP+")
-                    form_factor = st.selectbox("Form Factor *", ["SFP", "SFP+", "SFP28", "QSFP+", "QSFP28", "QSFP-DD"])
-                    data_rate = st.selectbox("Data Rate *", ["1G", "10G", "25G", "40G", "100G", "400G"])
+                    form_factor = st.selectbox("Form Factor *", FORM_FACTORS)
+                    data_rate = st.selectbox("Data Rate *", DATA_RATES)
                     wavelength = st.text_input("Wavelength *", placeholder="e.g., 850nm")
                     reach = st.text_input("Reach *", placeholder="e.g., 300m (OM3)")
 
                 with col2:
-                    connector = st.selectbox("Connector *", ["LC", "SC", "MPO/MTP", "MPO-16"])
+                    connector = st.selectbox("Connector *", CONNECTORS)
                     temperature = st.text_input("Temperature *", placeholder="e.g., 0 to 70°C")
                     power = st.text_input("Power *", placeholder="e.g., 1.5W max")
-                    status = st.selectbox("Status *", ["Active", "EOL", "Discontinued"])
+                    status = st.selectbox("Status *", STATUSES)
                     description = st.text_area("Description *", placeholder="Enter detailed description")
 
                 submit_add = st.form_submit_button("Add Transceiver")
@@ -544,6 +580,7 @@ elif st.session_state.current_page == "admin":
 
                 if selected_sku:
                     transceiver = get_transceiver(selected_sku)
+                    version = loaded_version("edit", selected_sku)
 
                     with st.form("edit_transceiver_form"):
                         col1, col2 = st.columns(2)
@@ -553,13 +590,13 @@ elif st.session_state.current_page == "admin":
                             name = st.text_input("Name *", value=transceiver['name'])
                             form_factor = st.selectbox(
                                 "Form Factor *",
-                                ["SFP", "SFP+", "SFP28", "QSFP+", "QSFP28", "QSFP-DD"],
-                                index=["SFP", "SFP+", "SFP28", "QSFP+", "QSFP28", "QSFP-DD"].index(transceiver['form_factor'])
+                                FORM_FACTORS,
+                                index=FORM_FACTORS.index(transceiver['form_factor'])
                             )
                             data_rate = st.selectbox(
                                 "Data Rate *",
-                                ["1G", "10G", "25G", "40G", "100G", "400G"],
-                                index=["1G", "10G", "25G", "40G", "100G", "400G"].index(transceiver['data_rate'])
+                                DATA_RATES,
+                                index=DATA_RATES.index(transceiver['data_rate'])
                             )
                             wavelength = st.text_input("Wavelength *", value=transceiver['wavelength'])
                             reach = st.text_input("Reach *", value=transceiver['reach'])
@@ -567,15 +604,15 @@ elif st.session_state.current_page == "admin":
                         with col2:
                             connector = st.selectbox(
                                 "Connector *",
-                                ["LC", "SC", "MPO/MTP", "MPO-16"],
-                                index=["LC", "SC", "MPO/MTP", "MPO-16"].index(transceiver['connector'])
+                                CONNECTORS,
+                                index=CONNECTORS.index(transceiver['connector'])
                             )
                             temperature = st.text_input("Temperature *", value=transceiver['temperature'])
                             power = st.text_input("Power *", value=transceiver['power'])
                             status = st.selectbox(
                                 "Status *",
-                                ["Active", "EOL", "Discontinued"],
-                                index=["Active", "EOL", "Discontinued"].index(transceiver['status'])
+                                STATUSES,
+                                index=STATUSES.index(transceiver['status'])
                             )
                             description = st.text_area("Description *", value=transceiver['description'])
 
@@ -596,11 +633,18 @@ elif st.session_state.current_page == "admin":
                                 "status": status
                             }
 
-                            if update_transceiver(sku, updated_transceiver):
-                                st.success(f"✅ Successfully updated transceiver: {sku}")
-                                st.rerun()
+                            try:
+                                updated = update_transceiver(sku, updated_transceiver, expected_version=version)
+                            except ConcurrentModificationError as e:
+                                del st.session_state.edit_version
+                                st.error(f"❌ {e}. Reload the form to see the latest values.")
                             else:
-                                st.error(f"❌ Error updating transceiver!")
+                                if updated:
+                                    del st.session_state.edit_version
+                                    st.success(f"✅ Successfully updated transceiver: {sku}")
+                                    st.rerun()
+                                else:
+                                    st.error(f"❌ Error updating transceiver!")
             else:
                 st.warning("No transceivers available to edit.")
 
@@ -613,6 +657,7 @@ elif st.session_state.current_page == "admin":
 
                 if selected_sku:
                     transceiver = get_transceiver(selected_sku)
+                    version = loaded_version("delete", selected_sku)
 
                     st.warning(f"**Are you sure you want to delete this transceiver?**")
                     st.info(f"""
@@ -625,11 +670,18 @@ elif st.session_state.current_page == "admin":
                     col1, col2, col3 = st.columns([1, 1, 4])
                     with col1:
                         if st.button("🗑️ Confirm Delete", type="primary"):
-                            if delete_transceiver(selected_sku):
-                                st.success(f"✅ Successfully deleted transceiver: {selected_sku}")
-                                st.rerun()
+                            try:
+                                deleted = delete_transceiver(selected_sku, expected_version=version)
+                            except ConcurrentModificationError as e:
+                                del st.session_state.delete_version
+                                st.error(f"❌ {e}. Review the latest values before deleting.")
                             else:
-                                st.error(f"❌ Error deleting transceiver!")
+                                if deleted:
+                                    del st.session_state.delete_version
+                                    st.success(f"✅ Successfully deleted transceiver: {selected_sku}")
+                                    st.rerun()
+                                else:
+                                    st.error(f"❌ Error deleting transceiver!")
 
                     with col2:
                         if st.button("Cancel"):
@@ -637,6 +689,114 @@ elif st.session_state.current_page == "admin":
             else:
                 st.warning("No transceivers available to delete.")
 
+        elif admin_action == "Bulk Import":
+            st.markdown("### Bulk Import")
+            st.info(
+                "Upload a CSV or Excel (.xlsx) file with a header row containing: "
+                + ", ".join(CATALOG_COLUMNS)
+                + ". Rows are matched by SKU: existing transceivers are updated, new ones are added."
+            )
+
+            uploaded_file = st.file_uploader("Import File", type=["csv", "xlsx"])
+
+            if uploaded_file is not None:
+                # Validate first so errors can be reviewed before anything is written
+                uploaded_file.seek(0)
+                preview = import_transceivers(uploaded_file, dry_run=True)
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric("New", preview['added'])
+                col2.metric("Updated", preview['updated'])
+                col3.metric("Unchanged", preview['unchanged'])
+                col4.metric("Errors", len(preview['errors']))
+
+                if preview['errors']:
+                    st.warning("Rows with errors will be skipped:")
+                    st.dataframe(pd.DataFrame(preview['errors']), use_container_width=True, hide_index=True)
+
+                if st.button("📥 Import Transceivers", type="primary",
+                             disabled=not (preview['added'] or preview['updated'])):
+                    uploaded_file.seek(0)
+                    result = import_transceivers(uploaded_file)
+                    st.success(
+                        f"✅ Imported {result['added']} new and {result['updated']} updated transceivers."
+                    )
+
+        elif admin_action == "Diagnostics":
+            st.markdown("### Diagnostics")
+            st.caption(
+                "Timings of data operations and page sections in this server process. "
+                "Set OTC_METRICS_PORT to expose them to Prometheus."
+            )
+
+            watcher = get_watcher_status()
+            if watcher is None:
+                st.caption("Catalog watcher: off (set OTC_WATCH_INTERVAL to reload the catalog in the background)")
+            else:
+                st.caption(
+                    f"Catalog watcher: checking every {watcher['interval']:g}s"
+                    + (f" · last reload {time.strftime('%H:%M:%S', time.localtime(watcher['last_reload']))}"
+                       if 'last_reload' in watcher else "")
+                )
+                if 'last_error' in watcher:
+                    st.warning(
+                        f"The data files could not be loaded at "
+                        f"{time.strftime('%H:%M:%S', time.localtime(watcher['last_error_time']))}; "
+                        f"still serving the last good catalog. {watcher['last_error']}"
+                    )
+
+            cache = get_query_cache_stats()
+            st.caption(
+                f"Query cache: {cache['entries']} results, {cache['size'] / 2 ** 20:.1f} of "
+                f"{cache['budget'] / 2 ** 20:.0f} MiB · {cache['hits']} hits, {cache['misses']} misses, "
+                f"{cache['evictions']} evictions"
+            )
+
+            recording = st.toggle("Record timings", value=metrics.enabled())
+            if recording != metrics.enabled():
+                metrics.set_enabled(recording)
+
+            summary = metrics.summary()
+            if summary:
+                st.dataframe(
+                    pd.DataFrame([{
+                        "Metric": row['name'],
+                        "Labels": ", ".join(f"{k}={v}" for k, v in row['labels'].items()),
+                        "Count": row['count'],
+                        "Mean (ms)": row['mean'] * 1000,
+                        "p50 (ms)": row['p50'] * 1000,
+                        "p99 (ms)": row['p99'] * 1000,
+                    } for row in summary]),
+                    use_container_width=True,
+                    hide_index=True
+                )
+
+                st.markdown("#### Recent Timings")
+                st.dataframe(
+                    pd.DataFrame([{
+                        "Time": pd.Timestamp(entry['time'], unit='s'),
+                        "Metric": entry['name'],
+                        "Labels": ", ".join(f"{k}={v}" for k, v in entry['labels'].items()),
+                        "Duration (ms)": entry['seconds'] * 1000,
+                    } for entry in metrics.recent(50)]),
+                    use_container_width=True,
+                    hide_index=True
+                )
+            else:
+                st.info("No timings recorded yet.")
+
+            col1, col2, col3 = st.columns([1, 1, 4])
+            with col1:
+                st.download_button(
+                    "⬇️ Prometheus Metrics",
+                    data=metrics.render_prometheus(),
+                    file_name="otc_metrics.prom",
+                    mime="text/plain"
+                )
+            with col2:
+                if st.button("Reset Timings"):
+                    metrics.reset()
+                    st.rerun()
+
 # Footer
 st.markdown("""
 <div class="ruckus-footer">
@@ -651,3 +811,5 @@ st.markdown("""
     </div>
 </div>
 """, unsafe_allow_html=True)
+
+metrics.observe("rerun", time.perf_counter() - _rerun_started, page=st.session_state.current_page)
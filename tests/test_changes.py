@@ -0,0 +1,84 @@
+import json
+import os
+import pytest
+import data_manager
+
+
+def _record(sku: str, name: str) -> dict:
+    return {
+        'sku': sku, 'name': name, 'form_factor': 'SFP+', 'data_rate': '10G',
+        'wavelength': '850nm', 'reach': '300m', 'connector': 'LC',
+        'temperature': '0 to 70°C', 'power': '1W', 'description': name, 'status': 'Active',
+    }
+
+
+@pytest.fixture
+def catalog_files(tmp_path, monkeypatch):
+    """Point data_manager at an empty JSON catalog in ``tmp_path``."""
+    monkeypatch.setattr(data_manager, 'DATA_FILE', str(tmp_path / "transceivers.json"))
+    monkeypatch.setattr(data_manager, 'JOURNAL_FILE', str(tmp_path / "transceivers.journal"))
+    monkeypatch.setattr(data_manager, 'COLUMNAR_FILE', str(tmp_path / "transceivers.cols"))
+    monkeypatch.setattr(data_manager, 'STORAGE_BACKEND', "json")
+    data_manager.invalidate_cache()
+    yield tmp_path
+    data_manager.invalidate_cache()
+
+
+def _overwrite(path: str, records: list):
+    """Replace the data file the way a sync job would, behind data_manager's back."""
+    with open(path, 'w') as f:
+        json.dump(records, f)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_changes_since_reports_writes(catalog_files):
+    data_manager.add_transceiver(_record("SKU-1", "One"))
+    version = data_manager.get_catalog_version()
+    data_manager.update_transceiver("SKU-1", _record("SKU-1", "Uno"))
+
+    result = data_manager.changes_since(version)
+
+    assert result['snapshot'] is None
+    assert result['version'] == version + 1
+    assert [(c['op'], c['sku'], c['changes']) for c in result['changes']] == [
+        ('update', "SKU-1", {'name': "Uno", 'description': "Uno"}),
+    ]
+    assert data_manager.changes_since(result['version'])['changes'] == []
+
+
+def test_changes_since_after_data_file_overwritten(catalog_files):
+    data_manager.add_transceiver(_record("SKU-1", "One"))
+    data_manager.compact_journal()
+    version = data_manager.get_catalog_version()
+    tag = data_manager.get_catalog_tag()
+
+    _overwrite(data_manager.DATA_FILE, [_record("SKU-1", "Synced"), _record("SKU-2", "Two")])
+    result = data_manager.changes_since(version)
+
+    assert result['version'] > version
+    assert result['changes'] == []
+    assert [(t['sku'], t['name']) for t in result['snapshot']] == [("SKU-1", "Synced"), ("SKU-2", "Two")]
+    assert data_manager.get_catalog_version() == result['version']
+    assert data_manager.get_catalog_tag() != tag
+    assert data_manager.changes_since(result['version']) == {
+        'version': result['version'], 'changes': [], 'snapshot': None,
+    }
+
+
+def test_overwritten_data_file_keeps_journal_entries(catalog_files):
+    data_manager.add_transceiver(_record("SKU-1", "One"))
+    data_manager.compact_journal()
+    data_manager.add_transceiver(_record("SKU-3", "Three"))
+    version = data_manager.get_catalog_version()
+
+    _overwrite(data_manager.DATA_FILE, [_record("SKU-1", "Synced")])
+    data_manager.invalidate_cache()
+
+    assert data_manager.get_catalog_version() > version
+    assert sorted(t['sku'] for t in data_manager.load_transceivers()) == ["SKU-1", "SKU-3"]
+    assert data_manager.get_transceiver("SKU-1")['name'] == "Synced"
+    new_version = data_manager.get_catalog_version()
+    data_manager.update_transceiver("SKU-3", _record("SKU-3", "Tres"))
+    result = data_manager.changes_since(new_version)
+    assert [(c['version'], c['sku']) for c in result['changes']] == [(new_version + 1, "SKU-3")]